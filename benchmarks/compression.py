@@ -0,0 +1,46 @@
+import sys
+import time
+
+from sc_compression import Decompressor
+from sc_compression.signatures import Signatures
+
+from sc.utils import SCCompressor
+
+
+
+# Compressed size and time of every save option
+#
+#   python benchmarks/compression.py path/to/file.sc [path/to/other_file.sc ...]
+
+OPTIONS = [
+    ("none", dict(signature=Signatures.NONE)),
+    ("sc lzma (default)", dict()),
+    ("sc lzma level=1", dict(level=1)),
+    ("sc lzma level=9", dict(level=9)),
+    ("sc zstd", dict(file_version=3)),
+    ("sc zstd level=1", dict(file_version=3, level=1)),
+    ("sc zstd level=19", dict(file_version=3, level=19)),
+    ("sc zstd level=19 threads=-1", dict(file_version=3, level=19, threads=-1)),
+]
+
+
+def main(paths: list):
+    for fp in paths:
+        # Options are compared on the same decompressed content, that is what save compresses
+        data = Decompressor().decompress(open(fp, 'rb').read())
+
+        print(f"{fp}: {len(data)} bytes")
+        print(f"  {'option':<30} {'size':>12} {'ratio':>7} {'time':>9}")
+
+        for name, options in OPTIONS:
+            compressor = SCCompressor(options.get("level"), options.get("threads", 0))
+
+            start = time.perf_counter()
+            compressed = compressor.compress(data, options.get("signature", Signatures.SC), options.get("file_version", 1))
+            elapsed = time.perf_counter() - start
+
+            print(f"  {name:<30} {len(compressed):>12} {len(data) / len(compressed):>7.2f} {elapsed:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
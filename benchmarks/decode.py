@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import struct
+
+from sc import SWFTexture
+
+
+
+# Texture decoding speed of every pixel type, in megapixels per second
+#
+#   python benchmarks/decode.py [size]
+#
+# Before textures were decoded with numpy, pixels were read one by one:
+#
+#   pixel type    per pixel    numpy
+#    0 RGBA8888     0.5 MP/s   1600 MP/s
+#    2 RGBA4444     0.7 MP/s     85 MP/s
+#    3 RGBA5551     0.9 MP/s     87 MP/s
+#    4 RGB565       0.8 MP/s    128 MP/s
+#    6 LA88         1.2 MP/s    130 MP/s
+#   10 L8           2.9 MP/s   6000 MP/s
+
+PIXEL_SIZES = {
+    0: 4,
+    2: 2,
+    3: 2,
+    4: 2,
+    6: 2,
+    10: 1
+}
+
+
+class Owner:
+    # Texture only asks its file whether pixels are kept in a separate texture file
+    external_texture_file = False
+
+
+def main(size: int = 2048):
+    print(f"{size}x{size}")
+    print(f"  {'pixel type':<10} {'time':>9} {'speed':>12}")
+
+    for pixel_type, pixel_size in PIXEL_SIZES.items():
+        data = struct.pack("<BHH", pixel_type, size, size) + os.urandom(size * size * pixel_size)
+
+        # Best of a few runs, first one also pays for imports and allocations
+        elapsed = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            texture = SWFTexture(1)
+            texture.load(data, Owner())
+            texture.image
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        print(f"  {pixel_type:<10} {elapsed:>8.3f}s {size * size / elapsed / 1e6:>7.1f} MP/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,45 @@
+import sys
+import tracemalloc
+
+from sc import SupercellSWF
+
+
+
+# Memory taken by loaded shapes and movie clip frames
+#
+#   python benchmarks/memory.py path/to/file.sc
+
+def measure(load):
+    tracemalloc.start()
+    objects = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return objects, size
+
+
+def main(fp: str):
+    for compact in (False, True):
+        swf = SupercellSWF()
+        swf.load(fp, lazy=True, compact=compact)
+
+        # Everything movie clips point to is loaded first, so only shapes and frames are measured
+        for transform_storage in swf.transforms:
+            list(transform_storage.matrices)
+            list(transform_storage.color_transforms)
+        
+        list(swf.text_fields)
+
+        shapes, shapes_size = measure(lambda: list(swf.shapes))
+        movie_clips, movie_clips_size = measure(lambda: list(swf.movie_clips))
+
+        bitmaps_count = sum(len(shape.bitmaps) for shape in shapes)
+        frames_count = sum(len(movie_clip.frames) for movie_clip in movie_clips)
+
+        print(f"compact={compact}")
+        print(f"  {len(shapes)} shapes, {bitmaps_count} bitmaps: {shapes_size / max(len(shapes), 1):.0f} bytes per shape")
+        print(f"  {len(movie_clips)} movie clips, {frames_count} frames: {movie_clips_size / max(frames_count, 1):.0f} bytes per frame")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
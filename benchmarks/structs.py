@@ -0,0 +1,166 @@
+import sys
+import time
+from io import BytesIO
+
+from sc.utils import Reader, Writer
+
+
+
+# Reading and writing time of record fields, field by field from BytesIO as before and with precompiled structs
+#
+#   python benchmarks/structs.py [count]
+#
+# Figures of 20000 records, nanoseconds per record:
+#
+#   field               bytesio    struct
+#   read_matrix2x3         3104       755
+#   read_bgra              1440       301
+#   read_transform         1424       334
+#   read_int                571       180
+#   write_matrix2x3        4706      1871
+#   write_bgra             1059       792
+#   write_transform         860       666
+#   write_int               460       322
+
+MATRIX = [[0.5, -0.25, 12.35], [0.25, 0.5, -3.4]]
+COLOR = [255, 128, 64, 32]
+TRANSFORM = (1, 2, 3)
+
+
+def read_int(stream: BytesIO) -> int:
+    return int.from_bytes(stream.read(4), "little", signed=True)
+
+
+def read_unsigned(stream: BytesIO, size: int) -> int:
+    return int.from_bytes(stream.read(size), "little", signed=False)
+
+
+def write_int(stream: BytesIO, value: int) -> None:
+    stream.write(value.to_bytes(4, "little", signed=True))
+
+
+def write_unsigned(stream: BytesIO, value: int, size: int) -> None:
+    stream.write(value.to_bytes(size, "little", signed=False))
+
+
+def old_read_matrix2x3(stream: BytesIO):
+    scale_x = read_int(stream) / 1024
+    rotation_x = read_int(stream) / 1024
+    rotation_y = read_int(stream) / 1024
+    scale_y = read_int(stream) / 1024
+
+    x, y = read_int(stream) / 20, read_int(stream) / 20
+
+    return [
+        [scale_x, rotation_x, x],
+        [rotation_y, scale_y, y]
+    ]
+
+
+def old_read_bgra(stream: BytesIO):
+    b = read_unsigned(stream, 1)
+    g = read_unsigned(stream, 1)
+    r = read_unsigned(stream, 1)
+    a = read_unsigned(stream, 1)
+    return [r, g, b, a]
+
+
+def old_read_transform(stream: BytesIO):
+    return read_unsigned(stream, 2), read_unsigned(stream, 2), read_unsigned(stream, 2)
+
+
+def old_write_matrix2x3(stream: BytesIO, matrix: list):
+    write_int(stream, int(round(matrix[0][0] * 1024)))
+    write_int(stream, int(round(matrix[0][1] * 1024)))
+    write_int(stream, int(round(matrix[1][0] * 1024)))
+    write_int(stream, int(round(matrix[1][1] * 1024)))
+
+    write_int(stream, int(round(matrix[0][2] * 20)))
+    write_int(stream, int(round(matrix[1][2] * 20)))
+
+
+def old_write_bgra(stream: BytesIO, color: list):
+    r, g, b, a = color
+    write_unsigned(stream, b, 1)
+    write_unsigned(stream, g, 1)
+    write_unsigned(stream, r, 1)
+    write_unsigned(stream, a, 1)
+
+
+def old_write_transform(stream: BytesIO, bind_id: int, matrix_id: int, color_transform_id: int):
+    write_unsigned(stream, bind_id, 2)
+    write_unsigned(stream, matrix_id, 2)
+    write_unsigned(stream, color_transform_id, 2)
+
+
+def records(write, count: int) -> bytes:
+    writer = Writer()
+    for _ in range(count):
+        write(writer)
+    
+    return writer.buffer
+
+
+def measure(function, count: int) -> float:
+    # Best of a few runs in nanoseconds per record
+    elapsed = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    return elapsed / count * 1e9
+
+
+def main(count: int = 20000):
+    matrices = records(lambda writer: writer.write_matrix2x3(MATRIX), count)
+    colors = records(lambda writer: writer.write_bgra(COLOR), count)
+    transforms = records(lambda writer: writer.write_transform(*TRANSFORM), count)
+    ints = records(lambda writer: writer.write_int(-1234), count)
+
+    def read(old_read, new_read, data: bytes):
+        def old():
+            stream = BytesIO(data)
+            for _ in range(count):
+                old_read(stream)
+
+        def new():
+            reader = Reader(data)
+            for _ in range(count):
+                new_read(reader)
+
+        return old, new
+
+    def write(old_write, new_write, *values):
+        def old():
+            stream = BytesIO()
+            for _ in range(count):
+                old_write(stream, *values)
+
+        def new():
+            writer = Writer()
+            for _ in range(count):
+                new_write(writer, *values)
+
+        return old, new
+
+    fields = [
+        ("read_matrix2x3", read(old_read_matrix2x3, Reader.read_matrix2x3, matrices)),
+        ("read_bgra", read(old_read_bgra, Reader.read_bgra, colors)),
+        ("read_transform", read(old_read_transform, Reader.read_transform, transforms)),
+        ("read_int", read(read_int, Reader.read_int, ints)),
+        ("write_matrix2x3", write(old_write_matrix2x3, Writer.write_matrix2x3, MATRIX)),
+        ("write_bgra", write(old_write_bgra, Writer.write_bgra, COLOR)),
+        ("write_transform", write(old_write_transform, Writer.write_transform, *TRANSFORM)),
+        ("write_int", write(write_int, Writer.write_int, -1234)),
+    ]
+
+    print(f"{count} records, nanoseconds per record")
+    print(f"  {'field':<18} {'bytesio':>9} {'struct':>9}")
+
+    for name, (old, new) in fields:
+        print(f"  {name:<18} {measure(old, count):>9.0f} {measure(new, count):>9.0f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
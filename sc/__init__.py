@@ -1,2 +1,4 @@
-from .swf import SupercellSWF
-from .objects import MovieClip, MovieClipModifier, TextField, Shape, SWFTexture
\ No newline at end of file
+from .swf import SupercellSWF, SWFInfo, TagEntry
+from .objects import MovieClip, MovieClipModifier, TextField, Shape, SWFTexture
+from .atlas import AtlasPacker
+from .utils import FileCache
\ No newline at end of file
@@ -0,0 +1,202 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sc_compression.signatures import Signatures
+
+from .swf import SupercellSWF
+from .objects import MovieClip
+
+
+
+# Batch processing of .sc files and directories
+#
+#   python -m sc info path/to/dir
+#   python -m sc textures path/to/dir -o out --jobs 4
+#   python -m sc resave path/to/dir -o out --zstd --level 19
+#   python -m sc render path/to/file.sc -o out --export name
+
+def find_files(paths: list) -> list:
+    # Every job is (file, texture file or None, file path relative to its input)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.endswith(".sc"):
+                        fp = os.path.join(directory, name)
+                        files.append((fp, os.path.relpath(fp, path)))
+        else:
+            files.append((path, os.path.basename(path)))
+
+    jobs = []
+    found = {os.path.abspath(fp) for fp, _ in files}
+    for fp, relative_fp in sorted(files):
+        if fp.endswith("_tex.sc"):
+            # Texture file is handled together with its .sc file, so it is never read twice
+            if os.path.abspath(fp[:-len("_tex.sc")] + ".sc") in found:
+                continue
+
+            jobs.append((fp, None, relative_fp))
+        else:
+            texture_fp = os.path.splitext(fp)[0] + "_tex.sc"
+            jobs.append((fp, texture_fp if os.path.isfile(texture_fp) else None, relative_fp))
+
+    return jobs
+
+
+def info(fp: str, texture_fp: str, relative_fp: str, args) -> str:
+    if fp.endswith("_tex.sc"):
+        textures = [f"{texture.width}x{texture.height}" for texture in SupercellSWF().iter_textures(fp)]
+        return f"texture file, {len(textures)} textures {' '.join(textures)}"
+
+    swf_info = SupercellSWF.read_info(fp)
+    return (
+        f"{swf_info.shapes_count} shapes, {swf_info.movie_clips_count} movie clips, {swf_info.textures_count} textures, "
+        f"{swf_info.text_fields_count} text fields, {swf_info.matrices_count} matrices, {swf_info.color_transforms_count} color transforms, "
+        f"{len(swf_info.exports)} exports" + (", texture file" if texture_fp else "")
+    )
+
+
+def textures(fp: str, texture_fp: str, relative_fp: str, args) -> str:
+    if fp.endswith("_tex.sc") or texture_fp is not None:
+        # Texture file is streamed, only one texture is kept in memory
+        texture_list = SupercellSWF().iter_textures(texture_fp or fp)
+    else:
+        swf = SupercellSWF()
+        swf.load(fp, load_texture_file=False, lazy=True)
+
+        if swf.external_texture_file:
+            raise TypeError("Texture file is missing!")
+
+        texture_list = swf.textures
+
+    base_fp = os.path.join(args.output, os.path.splitext(relative_fp)[0])
+    os.makedirs(os.path.dirname(base_fp), exist_ok=True)
+
+    count = 0
+    for i, texture in enumerate(texture_list):
+        texture.image.save(f"{base_fp}_{i}.png")
+        count += 1
+
+    return f"{count} textures"
+
+
+def resave(fp: str, texture_fp: str, relative_fp: str, args) -> str:
+    swf = SupercellSWF()
+    swf.load(fp)
+
+    save_fp = os.path.join(args.output, relative_fp)
+    os.makedirs(os.path.dirname(save_fp), exist_ok=True)
+
+    swf.save(save_fp, True, Signatures.NONE if args.raw else Signatures.SC, 3 if args.zstd else 1, args.level, args.threads)
+
+    return f"{os.path.getsize(fp)} -> {os.path.getsize(save_fp)} bytes"
+
+
+def render(fp: str, texture_fp: str, relative_fp: str, args) -> str:
+    if fp.endswith("_tex.sc"):
+        raise TypeError("Texture file has no exports!")
+
+    # Only chosen exports and objects they use are loaded
+    swf = SupercellSWF()
+    swf.load(fp, exports=args.export)
+
+    base_fp = os.path.join(args.output, os.path.splitext(relative_fp)[0])
+    os.makedirs(base_fp, exist_ok=True)
+
+    count = 0
+    skipped_count = 0
+    for export in swf.exports:
+        movie_clip = swf.get_export_by_id(export.export_id)
+        if not isinstance(movie_clip, MovieClip):
+            continue
+
+        name = "".join(char if char.isalnum() or char in "-_." else "_" for char in export.name)
+        gif_fp = os.path.join(base_fp, f"{name}.gif")
+
+        # Movie clip without shapes in its frames writes nothing, so GIF of an earlier run must not be counted
+        if os.path.isfile(gif_fp):
+            os.remove(gif_fp)
+
+        movie_clip.render(gif_fp)
+        if os.path.isfile(gif_fp):
+            count += 1
+        else:
+            skipped_count += 1
+
+    return f"{count} exports, {skipped_count} skipped"
+
+
+COMMANDS = {
+    "info": info,
+    "textures": textures,
+    "resave": resave,
+    "render": render
+}
+
+
+def run(command: str, fp: str, texture_fp: str, relative_fp: str, args) -> tuple:
+    # Errors are given back as results, so one broken file doesn't stop others
+    start = time.perf_counter()
+    try:
+        result = COMMANDS[command](fp, texture_fp, relative_fp, args)
+        failed = False
+    except Exception as exception:
+        result = f"{type(exception).__name__}: {exception}"
+        failed = True
+
+    return fp, failed, result, time.perf_counter() - start
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sc", description="Batch processing of Supercell .sc files")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("paths", nargs="+", help=".sc files or directories, texture files are paired with their .sc files")
+    parser.add_argument("-o", "--output", default="out", help="output directory, input directory structure is kept there")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of files processed at the same time")
+    parser.add_argument("--export", action="append", help="export name to render, can be given many times (render)")
+    parser.add_argument("--level", type=int, help="LZMA preset or Zstandard level (resave)")
+    parser.add_argument("--zstd", action="store_true", help="save SC with Zstandard (resave)")
+    parser.add_argument("--threads", type=int, default=0, help="Zstandard threads (resave)")
+    parser.add_argument("--raw", action="store_true", help="save without compression (resave)")
+
+    args = parser.parse_args(argv)
+
+    jobs = find_files(args.paths)
+    if not jobs:
+        print("No .sc files found")
+        return 1
+
+    start = time.perf_counter()
+    failed_count = 0
+
+    def report(index: int, result: tuple):
+        fp, failed, message, elapsed = result
+        status = "FAILED " if failed else ""
+        print(f"[{index}/{len(jobs)}] {fp} {elapsed:.2f}s {status}{message}", flush=True)
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(min(args.jobs, len(jobs))) as executor:
+            futures = [executor.submit(run, args.command, *job, args) for job in jobs]
+
+            # Files are reported as they are done, not in order
+            for index, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                failed_count += result[1]
+                report(index, result)
+    else:
+        for index, job in enumerate(jobs, 1):
+            result = run(args.command, *job, args)
+            failed_count += result[1]
+            report(index, result)
+
+    print(f"{len(jobs)} files, {failed_count} failed, {time.perf_counter() - start:.2f}s")
+
+    return 1 if failed_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
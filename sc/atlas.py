@@ -0,0 +1,183 @@
+from .objects import SWFTexture, Bitmap
+from .objects.shape import Point
+
+from PIL import Image
+
+
+
+class Page:
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+
+        # Skyline segments as [x, y, width], from left to right
+        self.skyline: list = [[0, 0, width]]
+        self.placements: list = []
+    
+    def find_position(self, width: int, height: int):
+        best = None
+
+        for i, (x, _, _) in enumerate(self.skyline):
+            if x + width > self.width:
+                break
+
+            # Rect lies on the highest segment under it
+            y = 0
+            covered = 0
+            j = i
+            while covered < width:
+                y = max(y, self.skyline[j][1])
+                covered += self.skyline[j][2]
+                j += 1
+
+            if y + height > self.height:
+                continue
+
+            if best is None or (y + height, x) < (best[1] + height, best[0]):
+                best = x, y
+
+        return best
+    
+    def place(self, x: int, y: int, width: int, height: int):
+        skyline = []
+        for segment in self.skyline:
+            left, top, size = segment
+            right = left + size
+
+            if right <= x or left >= x + width:
+                skyline.append(segment)
+                continue
+
+            if left == x:
+                skyline.append([x, y + height, width])
+
+            if right > x + width:
+                skyline.append([x + width, top, right - x - width])
+
+        # Merging neighbours of the same height
+        self.skyline = [skyline[0]]
+        for segment in skyline[1:]:
+            if segment[1] == self.skyline[-1][1]:
+                self.skyline[-1][2] += segment[2]
+            else:
+                self.skyline.append(segment)
+
+
+class AtlasPacker:
+    def __init__(self, width: int = 2048, height: int = 2048, padding: int = 2, rotation: bool = False) -> None:
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.rotation = rotation
+
+        self._textures: list = []
+        self._usage: list = []
+    
+    @property
+    def textures(self):
+        return self._textures
+    
+    @property
+    def usage(self):
+        return self._usage
+    
+    def pack(self, images: list) -> list:
+        pages = []
+        placements = [None] * len(images)
+
+        # Placing big sprites first gives a flatter skyline
+        order = sorted(range(len(images)), key=lambda i: (max(images[i].size), min(images[i].size)), reverse=True)
+
+        for i in order:
+            width, height = images[i].size
+
+            sizes = [(width, height, False)]
+            if self.rotation and width != height:
+                sizes.append((height, width, True))
+
+            for page_id, page in enumerate(pages):
+                placement = self._find_position(page, sizes)
+                if placement is not None:
+                    break
+            else:
+                # Padding is only needed between sprites, so page gets it on the right and bottom edges
+                page_id = len(pages)
+                page = Page(self.width + self.padding, self.height + self.padding)
+
+                placement = self._find_position(page, sizes)
+                if placement is None:
+                    raise TypeError(f"Image {width}x{height} doesn't fit in {self.width}x{self.height} atlas page!")
+
+                pages.append(page)
+
+            x, y, width, height, rotated = placement
+            page.place(x, y, width + self.padding, height + self.padding)
+            page.placements.append(i)
+
+            placements[i] = page_id, x, y, rotated
+
+        # Pages are cut down to their used area
+        for page in pages:
+            right = 0
+            bottom = 0
+            area = 0
+
+            for i in page.placements:
+                page_id, x, y, rotated = placements[i]
+                width, height = images[i].size
+                if rotated:
+                    width, height = height, width
+
+                right = max(right, x + width)
+                bottom = max(bottom, y + height)
+                area += width * height
+
+            image = Image.new("RGBA", (right, bottom))
+            for i in page.placements:
+                page_id, x, y, rotated = placements[i]
+                sprite = images[i].convert("RGBA")
+                if rotated:
+                    sprite = sprite.transpose(Image.ROTATE_270)
+
+                image.paste(sprite, (x, y))
+
+            texture = SWFTexture()
+            texture.from_image(image)
+
+            self._textures.append(texture)
+            self._usage.append(area / (right * bottom) if area else 0.0)
+
+        textures = self._textures[len(self._textures) - len(pages):]
+
+        bitmaps = []
+        for i, (page_id, x, y, rotated) in enumerate(placements):
+            width, height = images[i].size
+
+            bitmap = Bitmap()
+            bitmap.texture = textures[page_id]
+
+            bitmap.twips = [Point(0, 0), Point(width, 0), Point(width, height), Point(0, height)]
+
+            if rotated:
+                # Sprite is turned clockwise, so its top left corner is at the top right in atlas
+                bitmap.uvs = [Point(x + height, y), Point(x + height, y + width), Point(x, y + width), Point(x, y)]
+            else:
+                bitmap.uvs = [Point(x, y), Point(x + width, y), Point(x + width, y + height), Point(x, y + height)]
+
+            bitmaps.append(bitmap)
+
+        return bitmaps
+    
+    def _find_position(self, page: Page, sizes: list):
+        best = None
+
+        for width, height, rotated in sizes:
+            position = page.find_position(width + self.padding, height + self.padding)
+            if position is None:
+                continue
+
+            x, y = position
+            if best is None or (y + height, x) < (best[1] + best[3], best[0]):
+                best = x, y, width, height, rotated
+
+        return best
@@ -7,4 +7,5 @@ from .text_field import TextField
 from .transform_storage import TransformStorage
 from .matrix import Matrix2x3
 from .color_transform import ColorTransform
+from .transform_array import TransformArray, MatrixArray, ColorTransformArray
 from .movie_clip import MovieClip, Frame, ScalingGrid, TransformStorageIndex
\ No newline at end of file
@@ -1,5 +1,7 @@
 from .tag import Tag
 
+from sc.utils import quantize_color_transform
+
 
 
 class ColorTransform(Tag):
@@ -14,9 +16,15 @@ class ColorTransform(Tag):
         
         self.addition = self.read_bgra()
         self.multiplier = self.read_bgr()
+
+        self.release()
     
     def save(self):
         super().save()
 
         self.write_bgra(self.addition)
         self.write_bgr(self.multiplier)
+    
+    def key(self) -> tuple:
+        # Values in saved order, BGRA addition and BGR multiplier
+        return quantize_color_transform(self.addition, self.multiplier)
@@ -1,4 +1,6 @@
 class Export:
+    __slots__ = ("export_id", "name")
+
     def __init__(self) -> None:
         self.export_id: int = 0
         self.name: str = None
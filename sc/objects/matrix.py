@@ -1,5 +1,7 @@
 from .tag import Tag
 
+from sc.utils import quantize_matrix
+
 from math import sqrt, radians, degrees, atan2, sin, cos
 
 
@@ -61,8 +63,15 @@ class Matrix2x3(Tag):
         super().load(data)
 
         self.matrix = self.read_matrix2x3()
+
+        # Matrix is as fast to write again as to copy, so loaded bytes aren't kept
+        self.release()
     
     def save(self):
         super().save()
 
         self.write_matrix2x3(self.matrix)
+    
+    def key(self) -> tuple:
+        # Values as they are saved, matrices with the same key are saved as the same bytes
+        return quantize_matrix(self.matrix)
@@ -6,6 +6,7 @@ from .matrix import Matrix2x3
 from .color_transform import ColorTransform
 
 import math
+import numpy as np
 from PIL import Image
 
 
@@ -25,10 +26,24 @@ class MovieClip(Tag):
 
         self._frames: list = []
         self.scaling_grid: ScalingGrid = None
+
+        # Compact frames, rows of (bind id, matrix id, color transform id) like in file
+        self._frame_table: np.ndarray = None
+        self._frame_offsets: np.ndarray = None
+        self._frame_counts: np.ndarray = None
+        self._frame_names: list = None
+
+        # Transform storage lists matrix and color transform ids of frame table point to
+        self._matrices = None
+        self._color_transforms = None
     
     @property
     def frames(self):
         return self._frames
+    
+    @property
+    def compact(self):
+        return self._frame_table is not None
 
     def bind(self, obj: Tag, blend: int = 0, name: str = None):
         self.binds.append(obj)
@@ -46,6 +61,8 @@ class MovieClip(Tag):
             multiplier: list = None,
             alpha: int = None
         ):
+        self.expand_frames()
+
         if len(self.frames) < frame_index + 1:
             while len(self.frames) != frame_index + 1:
                 self._frames.append(Frame())
@@ -86,6 +103,46 @@ class MovieClip(Tag):
     def frame_name(self, frame_index: int, name: str):
         self._frames[frame_index].name = name
     
+    def expand_frames(self):
+        # Frame table is turned into Frame tags, so frames can be changed like loaded ones
+        if self._frame_table is None:
+            return
+        
+        frames = []
+        for view in self._frames:
+            frame = Frame()
+            frame.name = view.name
+            frame.resources = view.resources
+
+            frames.append(frame)
+        
+        self._frames = frames
+
+        self._frame_table = None
+        self._frame_offsets = None
+        self._frame_counts = None
+        self._frame_names = None
+
+        self._matrices = None
+        self._color_transforms = None
+    
+    def take_transforms(self, transform_storage, taken: dict, matrix_values: dict = None, color_transform_values: dict = None):
+        # Matrices and color transforms of frame table are copied into compact transform storage once
+        table = self._frame_table.astype(np.int64)
+
+        matrix_ids = table[:, 1]
+        used = matrix_ids != 0xFFFF
+        matrix_ids[used] = transform_storage.matrices.take(self._matrices, matrix_ids[used], taken, matrix_values)
+
+        color_transform_ids = table[:, 2]
+        used = color_transform_ids != 0xFFFF
+        color_transform_ids[used] = transform_storage.color_transforms.take(self._color_transforms, color_transform_ids[used], taken, color_transform_values)
+
+        self._frame_table = table.astype(np.uint16)
+
+        self._matrices = transform_storage.matrices
+        self._color_transforms = transform_storage.color_transforms
+    
     def scale(self, x: float, y: float, width: float, height: float):
         self.scaling_grid = ScalingGrid()
 
@@ -95,7 +152,7 @@ class MovieClip(Tag):
         self.scaling_grid.width = width + x
         self.scaling_grid.height = height + y
 
-    def load(self, data: bytes, swf):
+    def load(self, data: bytes, swf, compact: bool = False):
         super().load(data)
 
         self.export_id = self.read_unsigned_short()
@@ -108,15 +165,23 @@ class MovieClip(Tag):
             raise TypeError("TAG_MOVIE_CLIP_4 no longer support")
 
         frames_count = self.read_unsigned_short()
-        self._frames = [_cls() for _cls in [Frame] * frames_count]
 
-        transforms = []
-        for x in range(self.read_int()):
-            transforms.append({
-                "bind_id": self.read_unsigned_short(),
-                "matrix_id": self.read_unsigned_short(),
-                "color_transform_id": self.read_unsigned_short()
-            })
+        transforms_count = self.read_int()
+        if compact:
+            self._frame_table = np.frombuffer(self.read(transforms_count * 6), "<u2").reshape(transforms_count, 3)
+            self._frame_names = []
+            frame_counts = []
+        else:
+            self._frames = [_cls() for _cls in [Frame] * frames_count]
+
+            transforms = []
+            for x in range(transforms_count):
+                bind_id, matrix_id, color_transform_id = self.read_transform()
+                transforms.append({
+                    "bind_id": bind_id,
+                    "matrix_id": matrix_id,
+                    "color_transform_id": color_transform_id
+                })
         
         binds_count = self.read_unsigned_short()
 
@@ -145,6 +210,12 @@ class MovieClip(Tag):
                 frame = Frame(frame_tag)
                 resources_count = frame.load(frame_data)
 
+                if compact:
+                    # Only name and resources count are kept, resources stay in frame table
+                    self._frame_names.append(frame.name)
+                    frame_counts.append(resources_count)
+                    continue
+
                 for x in range(resources_count):
                     transform = transforms[current_transform + x]
 
@@ -177,9 +248,21 @@ class MovieClip(Tag):
 
             else:
                 raise TypeError(f"Unknown tag in MovieClip, {frame_tag}")
+        
+        if compact:
+            self._frame_counts = np.array(frame_counts, np.uint32)
+            self._frame_offsets = np.cumsum(self._frame_counts) - self._frame_counts
+
+            self._matrices = swf.transforms[self.transform_storage_id].matrices
+            self._color_transforms = swf.transforms[self.transform_storage_id].color_transforms
+
+            self._frames = [FrameView(self, i) for i in range(len(self._frame_names))]
     
     @property
     def matrices_count(self):
+        if self._frame_table is not None:
+            return int(np.count_nonzero(self._frame_table[:, 1] != 0xFFFF))
+        
         result = 0
         for frame in self.frames:
             for bind_id in frame.resources:
@@ -188,6 +271,9 @@ class MovieClip(Tag):
     
     @property
     def color_transforms_count(self):
+        if self._frame_table is not None:
+            return int(np.count_nonzero(self._frame_table[:, 2] != 0xFFFF))
+        
         result = 0
         for frame in self.frames:
             for bind_id in frame.resources:
@@ -208,6 +294,43 @@ class MovieClip(Tag):
         
         self.write_unsigned_short(len(self.frames))
 
+        if self._frame_table is not None:
+            # Frame table ids already point to transform storage of clip
+            self.write_int(len(self._frame_table))
+            self.write(self._frame_table.astype("<u2").tobytes())
+        else:
+            self._save_transforms(swf)
+        
+        self.write_unsigned_short(len(self.binds))
+
+        for obj in self.binds:
+            self.write_unsigned_short(obj.export_id)
+        
+        if self.tag in (35, 12):
+            for blend in self.blends:
+                self.write_unsigned_char(blend)
+        
+        for name in self.names:
+            self.write_ascii(name)
+        
+        if bool(self.transform_storage_id):
+            self.write_tag(TransformStorageIndex(), self.transform_storage_id)
+        
+        if self._frame_table is not None:
+            frame = Frame()
+            for name, resources_count in zip(self._frame_names, self._frame_counts.tolist()):
+                frame.name = name
+                self.write_tag(frame, resources_count)
+        else:
+            for frame in self.frames:
+                self.write_tag(frame)
+        
+        if self.scaling_grid:
+            self.write_tag(self.scaling_grid)
+        
+        self.write(bytes(5))
+    
+    def _save_transforms(self, swf):
         transforms = []
         for frame in self.frames:
             for bind_id in frame.resources:
@@ -217,10 +340,10 @@ class MovieClip(Tag):
                 color_transform_id = 0xFFFF
 
                 if resource["matrix"] is not None:
-                    matrix_id = swf.transforms[self.transform_storage_id].matrices.index(resource["matrix"])
+                    matrix_id = swf._index_of(swf.transforms[self.transform_storage_id].matrices, resource["matrix"])
                 
                 if resource["color_transform"] is not None:
-                    color_transform_id = swf.transforms[self.transform_storage_id].color_transforms.index(resource["color_transform"])
+                    color_transform_id = swf._index_of(swf.transforms[self.transform_storage_id].color_transforms, resource["color_transform"])
                 
                 transforms.append({
                     "bind_id": bind_id,
@@ -230,45 +353,7 @@ class MovieClip(Tag):
         
         self.write_int(len(transforms))
         for transform in transforms:
-            self.write_unsigned_short(transform["bind_id"])
-            self.write_unsigned_short(transform["matrix_id"])
-            self.write_unsigned_short(transform["color_transform_id"])
-        
-        self.write_unsigned_short(len(self.binds))
-
-        for obj in self.binds:
-            self.write_unsigned_short(obj.export_id)
-        
-        if self.tag in (35, 12):
-            for blend in self.blends:
-                self.write_unsigned_char(blend)
-        
-        for name in self.names:
-            self.write_ascii(name)
-        
-        if bool(self.transform_storage_id):
-            index = TransformStorageIndex()
-            index.save(self.transform_storage_id)
-
-            self.write_unsigned_char(index.tag)
-            self.write_unsigned_int(len(index.buffer))
-            self.write(index.buffer)
-        
-        for frame in self.frames:
-            frame.save()
-
-            self.write_unsigned_char(frame.tag)
-            self.write_unsigned_int(len(frame.buffer))
-            self.write(frame.buffer)
-        
-        if self.scaling_grid:
-            self.scaling_grid.save()
-
-            self.write_unsigned_char(self.scaling_grid.tag)
-            self.write_unsigned_int(len(self.scaling_grid.buffer))
-            self.write(self.scaling_grid.buffer)
-        
-        self.write(bytes(5))
+            self.write_transform(transform["bind_id"], transform["matrix_id"], transform["color_transform_id"])
     
     def render(self, fp: str):
         frames = []
@@ -326,15 +411,56 @@ class Frame(Tag):
         resources_count = self.read_unsigned_short()
         self.name = self.read_ascii()
 
+        self.release()
+
         return resources_count
     
-    def save(self):
+    def save(self, resources_count: int = None):
         super().save()
 
-        self.write_unsigned_short(len(list(self.resources.items())))
+        if resources_count is None:
+            resources_count = len(self.resources)
+
+        self.write_unsigned_short(resources_count)
         self.write_ascii(self.name)
 
 
+class FrameView:
+    # Frame of compact MovieClip, resources are read from frame table of clip
+    __slots__ = ("_clip", "_index")
+
+    tag = 11
+
+    def __init__(self, clip: MovieClip, index: int) -> None:
+        self._clip = clip
+        self._index = index
+    
+    @property
+    def name(self):
+        return self._clip._frame_names[self._index]
+    
+    @name.setter
+    def name(self, name: str):
+        self._clip._frame_names[self._index] = name
+    
+    @property
+    def resources(self):
+        # Built again on every access, changes to it aren't kept
+        clip = self._clip
+
+        offset = clip._frame_offsets[self._index]
+        count = clip._frame_counts[self._index]
+
+        resources = {}
+        for bind_id, matrix_id, color_transform_id in clip._frame_table[offset:offset + count].tolist():
+            resources[bind_id] = {
+                "matrix": clip._matrices[matrix_id] if matrix_id != 0xFFFF else None,
+                "color_transform": clip._color_transforms[color_transform_id] if color_transform_id != 0xFFFF else None
+            }
+        
+        return resources
+
+
 class ScalingGrid(Tag):
     def __init__(self, tag: int = 31) -> None:
         super().__init__(tag)
@@ -33,3 +33,6 @@ class MovieClipModifier(Tag):
         super().save()
 
         self.write_unsigned_short(self.export_id)
+    
+    def snapshot(self, swf) -> tuple:
+        return self.tag, self.export_id
@@ -7,6 +7,8 @@ from PIL import Image, ImageDraw
 
 
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float = 0.0, y: float = 0.0) -> None:
         self.x = x
         self.y = y
@@ -100,14 +102,17 @@ class Shape(Tag):
             self.write_unsigned_short(points_count)
         
         for bitmap in self.bitmaps:
-            bitmap.save(swf)
-
-            self.write_unsigned_char(bitmap.tag)
-            self.write_int(len(bitmap.buffer))
-            self.write(bitmap.buffer)
+            self.write_tag(bitmap, swf)
         
         self.write(bytes(5))
     
+    def snapshot(self, swf) -> tuple:
+        bitmaps = tuple(bitmap.snapshot(swf) for bitmap in self.bitmaps)
+        if None in bitmaps:
+            return None
+        
+        return self.tag, self.export_id, bitmaps
+    
     def to_image(self):
         # Creating shape region
         left = 0
@@ -173,6 +178,9 @@ class Bitmap(Tag):
             y = int(round(y))
 
             self.uvs[i].coordinate = (x, y)
+        
+        # Bitmap is saved with its shape, so loaded bytes are kept only by shape
+        self.release()
     
     def save(self, swf):
         super().save()
@@ -199,6 +207,20 @@ class Bitmap(Tag):
             self.write_unsigned_short(int(round(self.uvs[x].x * 0xFFFF / self.texture.width)))
             self.write_unsigned_short(int(round(self.uvs[x].y * 0xFFFF / self.texture.height)))
     
+    def snapshot(self, swf) -> tuple:
+        if self.texture is None or self.texture not in swf.textures:
+            return None
+        
+        # uvs are stored relative to texture size
+        return (
+            self.tag,
+            swf.textures.index(self.texture),
+            self.texture.width,
+            self.texture.height,
+            tuple(point.coordinate for point in self.twips),
+            tuple(point.coordinate for point in self.uvs)
+        )
+    
     def to_image(self):
         if not self.texture.image:
             return
@@ -233,7 +255,7 @@ class Bitmap(Tag):
         if mirroring:
             region = region.transform(region.size, Image.EXTENT, (region.size[0], 0, 0, region.size[1]))
         
-        region = region.resize(result_size, Image.ANTIALIAS).rotate(angle, expand=True)
+        region = region.resize(result_size, Image.LANCZOS).rotate(angle, expand=True)
 
         return region
 
@@ -56,11 +56,51 @@ END_TAG = 0
 
 
 class Tag(Reader, Writer):
+    # Parent buffer while tag is saved with Writer.write_tag
+    _output: bytearray = None
+    
     def __init__(self, tag: int = 0) -> None:
         self.tag = tag
+
+        self._view: memoryview = None
+        self._snapshot: tuple = None
+    
+    def __getstate__(self):
+        # Loaded bytes are a view of file content, so they are pickled as bytes
+        state = self.__dict__.copy()
+        if state.get("_view") is not None:
+            state["_view"] = bytes(state["_view"])
+        
+        return state
+    
+    @property
+    def buffer(self):
+        # Loaded bytes are passed on without copying until tag is saved again
+        if self._view is not None:
+            return self._view
+        
+        # Tag that was never saved has no bytes
+        return getattr(self, "_buffer", b"")
     
     def load(self, data: bytes):
         Reader.__init__(self, data)
     
+    def release(self):
+        # Tag that is always saved from its values drops loaded bytes and reader position after load
+        self._view = None
+        self._snapshot = None
+
+        vars(self).pop("_offset", None)
+    
     def save(self):
-        Writer.__init__(self)
+        # Tag saved with Writer.write_tag goes straight into the parent buffer
+        if self._output is not None:
+            Writer.__init__(self, self._output)
+        else:
+            Writer.__init__(self)
+
+        self._view = None
+    
+    def snapshot(self, swf) -> tuple:
+        # Values the tag is serialized from, tags without a snapshot are always saved again
+        return None
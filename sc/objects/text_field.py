@@ -118,4 +118,30 @@ class TextField(Tag):
 
             if self.tag == 44:
                 self.write_short(self.transform3)
-                self.write_bool(self.modifier7)
\ No newline at end of file
+                self.write_bool(self.modifier7)
+    
+    def snapshot(self, swf) -> tuple:
+        return (
+            self.tag,
+            self.export_id,
+            self.text,
+            self.font,
+            self.font_width,
+            self.font_size,
+            tuple(self.font_color),
+            tuple(self.font_outline_color),
+            self.left_corner,
+            self.top_corner,
+            self.right_corner,
+            self.bottom_corner,
+            self.italic,
+            self.ansi,
+            self.shiftJIS,
+            self.modifier4,
+            self.modifier5,
+            self.wideCodes,
+            self.modifier7,
+            self.transform1,
+            self.transform2,
+            self.transform3
+        )
\ No newline at end of file
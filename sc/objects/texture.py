@@ -1,9 +1,24 @@
 from .tag import Tag
 
+import hashlib
+import numpy as np
 from PIL import Image
 
 
 
+PIXEL_MODES = {
+    0: "RGBA",
+    1: "RGBA",
+    2: "RGBA",
+    3: "RGBA",
+    4: "RGB",
+    6: "LA",
+    10: "L"
+}
+
+CHUNK_SIZE = 32
+
+
 class SWFTexture(Tag):
     def __init__(self, tag: int = 1) -> None:
         super().__init__(tag)
@@ -12,7 +27,53 @@ class SWFTexture(Tag):
         self.width: int = 0
         self.height: int = 0
 
-        self.image: Image = None
+        self.cache_image: bool = True
+
+        self._image: Image = None
+        self._data: memoryview = None
+        self._data_header: tuple = None
+
+        # Image decoded from loaded pixels, they are still saved as they were loaded while it is unchanged
+        self._decoded: Image = None
+        self._decoded_digest: bytes = None
+    
+    def __getstate__(self):
+        state = super().__getstate__()
+        if state["_data"] is not None:
+            state["_data"] = bytes(state["_data"])
+        
+        # Decoded image can be decoded again from loaded pixels, unless it was handed out and could be changed
+        if state["_decoded_digest"] is None:
+            state["_decoded"] = None
+        
+        return state
+    
+    @property
+    def image(self):
+        if self._image is not None:
+            return self._image
+        
+        # Pixels are decoded on first access, until then only the raw payload is kept
+        if self._decoded is None and self._data is not None:
+            image = decode_image(self._data, *self._data_header)
+
+            if not self.cache_image:
+                return image
+            
+            self._decoded = image
+        
+        if self._decoded is not None and self._decoded_digest is None:
+            # Handed out image can be changed in place, save compares it with this digest
+            self._decoded_digest = image_digest(self._decoded)
+        
+        return self._decoded
+    
+    @image.setter
+    def image(self, image: Image):
+        self._image = image
+        self._data = None
+        self._decoded = None
+        self._decoded_digest = None
     
     def from_image(self, image: Image):
         self.width, self.height = image.size
@@ -38,169 +99,178 @@ class SWFTexture(Tag):
         self.width = self.read_unsigned_short()
         self.height = self.read_unsigned_short()
 
+        self._image = None
+        self._data = None
+        self._decoded = None
+        self._decoded_digest = None
+
         if not swf.external_texture_file:
-            pixels = []
-            read_pixel = None
-            if self.pixel_type in (0, 1):
-                mode = "RGBA"
-                def read_pixel():
-                    return self.read_unsigned_char(), self.read_unsigned_char(), self.read_unsigned_char(), self.read_unsigned_char()
-            
-            elif self.pixel_type == 2:
-                mode = "RGBA"
-                def read_pixel():
-                    p = self.read_unsigned_short()
-                    return (p >> 12 & 15) << 4, (p >> 8 & 15) << 4, (p >> 4 & 15) << 4, (p >> 0 & 15) << 4
-            
-            elif self.pixel_type == 3:
-                mode = "RGBA"
-                def read_pixel():
-                    p = self.read_unsigned_short()
-                    return (p >> 11 & 31) << 3, (p >> 6 & 31) << 3, (p >> 1 & 31) << 3, (p & 255) << 7
-            
-            elif self.pixel_type == 4:
-                mode = "RGB"
-                def read_pixel():
-                    p = self.read_unsigned_short()
-                    return (p >> 11 & 31) << 3, (p >> 5 & 63) << 2, (p & 31) << 3
-            
-            elif self.pixel_type == 6:
-                mode = "LA"
-                def read_pixel():
-                    p = self.read_unsigned_short()
-                    return p & 255, p >> 8
-            
-            elif self.pixel_type == 10:
-                mode = "L"
-                def read_pixel():
-                    return self.read_unsigned_char()
-            
-            else:
+            if self.pixel_type not in PIXEL_MODES:
                 raise TypeError(f"Unknown SWFTexture pixel type, {self.pixel_type}")
 
-            image = Image.new(mode, (self.width, self.height))
-
-            if read_pixel is not None:
-                for y in range(self.height):
-                    for x in range(self.width):
-                        pixels.append(read_pixel())
-            
-                image.putdata(pixels)
-            
-            if self.tag in (27, 28):
-                loaded_img = image.load()
-                pixel_index = 0
-                chunk_size = 32
-
-                x_chunks_count = self.width // chunk_size
-                y_chunks_count = self.height // chunk_size
-                x_rest = self.width % chunk_size
-                y_rest = self.height % chunk_size
-
-                for y_chunk in range(y_chunks_count):
-                    for x_chunk in range(x_chunks_count):
-                        for y in range(chunk_size):
-                            for x in range(chunk_size):
-                                loaded_img[x_chunk * chunk_size + x, y_chunk * chunk_size + y] = pixels[pixel_index]
-                                pixel_index += 1
-
-                    for y in range(chunk_size):
-                        for x in range(x_rest):
-                            loaded_img[(self.width - x_rest) + x, y_chunk * chunk_size + y] = pixels[pixel_index]
-                            pixel_index += 1
-                
-                for x_chunk in range(x_chunks_count):
-                    for y in range(y_rest):
-                        for x in range(chunk_size):
-                            loaded_img[x_chunk * chunk_size + x, (self.height - y_rest) + y] = pixels[pixel_index]
-                            pixel_index += 1
-
-                for y in range(y_rest):
-                    for x in range(x_rest):
-                        loaded_img[x + (self.width - x_rest), y + (self.height - y_rest)] = pixels[pixel_index]
-                        pixel_index += 1
-            
-            self.image = image
+            self._data = memoryview(data)[self.tell():]
+            self._data_header = (self.tag, self.pixel_type, self.width, self.height)
+        
+        # Pixels are kept in _data, so the whole tag isn't kept (and pickled) once more
+        self.release()
     
     def save(self, swf):
         super().save()
 
-        if self.image is not None:
-            self.from_image(self.image)
+        if self._image is not None:
+            self.from_image(self._image)
 
         self.write_unsigned_char(self.pixel_type)
         self.write_unsigned_short(self.width)
         self.write_unsigned_short(self.height)
 
         if not swf.external_texture_file:
-            if self.image is None:
+            if self._data is not None and self._data_header == (self.tag, self.pixel_type, self.width, self.height):
+                # Pixels weren't touched since load, so they are written as they were loaded
+                if self._decoded_digest is None or image_digest(self._decoded) == self._decoded_digest:
+                    self.write(self._data)
+                    return
+            
+            image = self.image
+            if image is None:
                 raise TypeError("SWFTexture has no Image!")
 
-            write_pixel = None
-            if self.pixel_type in (0, 1):
-                def write_pixel(pixel):
-                    r, g, b, a = pixel
-                    self.write_unsigned_char(r)
-                    self.write_unsigned_char(g)
-                    self.write_unsigned_char(b)
-                    self.write_unsigned_char(a)
-            
-            if self.pixel_type == 2:
-                def write_pixel(pixel):
-                    r, g, b, a = pixel
-                    self.write_unsigned_short(a >> 4 | b >> 4 << 4 | g >> 4 << 8 | r >> 4 << 12)
-            
-            if self.pixel_type == 3:
-                def write_pixel(pixel):
-                    r, g, b, a = pixel
-                    self.write_unsigned_short(a >> 7 | b >> 3 << 1 | g >> 3 << 6 | r >> 3 << 11)
-            
-            if self.pixel_type == 4:
-                def write_pixel(pixel):
-                    r, g, b = pixel
-                    self.write_unsigned_short(b >> 3 | g >> 2 << 5 | r >> 3 << 11)
-            
-            if self.pixel_type == 6:
-                def write_pixel(pixel):
-                    l, a = pixel
-                    self.write_unsigned_short(l >> 8 | a)
+            channels_count = len(image.getbands())
+            pixels = np.asarray(image).reshape(self.width * self.height, channels_count)
+
+            if self.tag in (27, 28):
+                pixels = tile_pixels(pixels, self.width, self.height)
             
-            if self.pixel_type == 10:
-                def write_pixel(pixel):
-                    self.write_unsigned_char(pixel)
-
-            if write_pixel is not None:
-                pixels = self.image.getdata()
-
-                if self.tag in (27, 28):
-                    pixels = []
-                    loaded_img = self.image.load()
-                    chunk_size = 32
-
-                    x_chunks_count = self.width // chunk_size
-                    y_chunks_count = self.height // chunk_size
-                    x_rest = self.width % chunk_size
-                    y_rest = self.height % chunk_size
-
-                    for y_chunk in range(y_chunks_count):
-                        for x_chunk in range(x_chunks_count):
-                            for y in range(chunk_size):
-                                for x in range(chunk_size):
-                                    pixels.append(loaded_img[x + (x_chunk * chunk_size), y + (y_chunk * chunk_size)])
-
-                        for y in range(chunk_size):
-                            for x in range(x_rest):
-                                pixels.append(loaded_img[x + (self.width - x_rest), y + (y_chunk * chunk_size)])
-
-                    for x_chunk in range(self.width // chunk_size):
-                        for y in range(y_rest):
-                            for x in range(chunk_size):
-                                pixels.append(loaded_img[x + (x_chunk * chunk_size), y + (self.height - y_rest)])
-
-                    for y in range(y_rest):
-                        for x in range(x_rest):
-                            pixels.append(loaded_img[x + (self.width - x_rest), y + (self.height - y_rest)])
-                
-                for y in range(self.height):
-                    for x in range(self.width):
-                        write_pixel(pixels[y * self.width + x])
+            self.write(encode_pixels(pixels, self.pixel_type))
+
+
+def image_digest(image: Image) -> bytes:
+    return hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+
+
+def decode_image(data: bytes, tag: int, pixel_type: int, width: int, height: int) -> Image:
+    pixels = decode_pixels(data, pixel_type, width * height)
+
+    if tag in (27, 28):
+        pixels = untile_pixels(pixels, width, height)
+    
+    return Image.frombytes(PIXEL_MODES[pixel_type], (width, height), pixels)
+
+
+def decode_pixels(data: bytes, pixel_type: int, count: int):
+    if pixel_type in (0, 1):
+        return np.frombuffer(data, np.uint8, count * 4).reshape(count, 4)
+    
+    if pixel_type == 10:
+        return np.frombuffer(data, np.uint8, count).reshape(count, 1)
+    
+    p = np.frombuffer(data, "<u2", count)
+
+    if pixel_type == 2:
+        channels = (p >> 12 & 15) << 4, (p >> 8 & 15) << 4, (p >> 4 & 15) << 4, (p & 15) << 4
+    
+    elif pixel_type == 3:
+        # alpha is clamped the same way Image.putdata clamps it
+        channels = (p >> 11 & 31) << 3, (p >> 6 & 31) << 3, (p >> 1 & 31) << 3, np.minimum((p & 255) << 7, 255)
+    
+    elif pixel_type == 4:
+        channels = (p >> 11 & 31) << 3, (p >> 5 & 63) << 2, (p & 31) << 3
+    
+    elif pixel_type == 6:
+        channels = p & 255, p >> 8
+    
+    else:
+        raise TypeError(f"Unknown SWFTexture pixel type, {pixel_type}")
+    
+    pixels = np.empty((count, len(channels)), np.uint8)
+    for i, channel in enumerate(channels):
+        pixels[:, i] = channel
+    
+    return pixels
+
+
+def encode_pixels(pixels, pixel_type: int) -> bytes:
+    if pixel_type in (0, 1, 10):
+        return np.ascontiguousarray(pixels, np.uint8).tobytes()
+    
+    channels = pixels.astype(np.uint16).T
+
+    if pixel_type == 2:
+        r, g, b, a = channels
+        p = a >> 4 | b >> 4 << 4 | g >> 4 << 8 | r >> 4 << 12
+    
+    elif pixel_type == 3:
+        r, g, b, a = channels
+        p = a >> 7 | b >> 3 << 1 | g >> 3 << 6 | r >> 3 << 11
+    
+    elif pixel_type == 4:
+        r, g, b = channels
+        p = b >> 3 | g >> 2 << 5 | r >> 3 << 11
+    
+    elif pixel_type == 6:
+        l, a = channels
+        p = l >> 8 | a
+    
+    else:
+        raise TypeError(f"Unknown SWFTexture pixel type, {pixel_type}")
+    
+    return p.astype("<u2").tobytes()
+
+
+def _tiled_strips(height: int):
+    # Tiled textures are stored as rows of 32x32 blocks, with the
+    # right and bottom edge blocks cut down to the remaining size
+    y_chunks_count = height // CHUNK_SIZE
+    y_rest = height % CHUNK_SIZE
+
+    yield 0, y_chunks_count, CHUNK_SIZE
+
+    if y_rest:
+        yield y_chunks_count * CHUNK_SIZE, 1, y_rest
+
+
+def untile_pixels(pixels, width: int, height: int):
+    channels_count = pixels.shape[1]
+
+    x_chunks_count = width // CHUNK_SIZE
+    x_rest = width % CHUNK_SIZE
+    chunks_width = x_chunks_count * CHUNK_SIZE
+
+    image = np.empty((height, width, channels_count), np.uint8)
+
+    pixel_index = 0
+    for y, strips_count, strip_height in _tiled_strips(height):
+        strip_size = strip_height * width
+        strips = pixels[pixel_index:pixel_index + strips_count * strip_size].reshape(strips_count, strip_size, channels_count)
+        pixel_index += strips_count * strip_size
+
+        rows_count = strips_count * strip_height
+        chunks = strips[:, :strip_height * chunks_width].reshape(strips_count, x_chunks_count, strip_height, CHUNK_SIZE, channels_count)
+        rest = strips[:, strip_height * chunks_width:]
+
+        image[y:y + rows_count, :chunks_width] = chunks.transpose(0, 2, 1, 3, 4).reshape(rows_count, chunks_width, channels_count)
+        image[y:y + rows_count, chunks_width:] = rest.reshape(rows_count, x_rest, channels_count)
+    
+    return image.reshape(width * height, channels_count)
+
+
+def tile_pixels(pixels, width: int, height: int):
+    channels_count = pixels.shape[1]
+
+    x_chunks_count = width // CHUNK_SIZE
+    x_rest = width % CHUNK_SIZE
+    chunks_width = x_chunks_count * CHUNK_SIZE
+
+    image = pixels.reshape(height, width, channels_count)
+
+    tiled = []
+    for y, strips_count, strip_height in _tiled_strips(height):
+        rows = image[y:y + strips_count * strip_height]
+
+        chunks = rows[:, :chunks_width].reshape(strips_count, strip_height, x_chunks_count, CHUNK_SIZE, channels_count)
+        chunks = chunks.transpose(0, 2, 1, 3, 4).reshape(strips_count, strip_height * chunks_width * channels_count)
+        rest = rows[:, chunks_width:].reshape(strips_count, strip_height * x_rest * channels_count)
+
+        tiled.append(np.concatenate((chunks, rest), axis=1).reshape(strips_count * strip_height * width, channels_count))
+    
+    return np.concatenate(tiled)
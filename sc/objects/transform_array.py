@@ -0,0 +1,221 @@
+from .tag import Tag
+
+from .matrix import Matrix2x3
+from .color_transform import ColorTransform
+
+import numpy as np
+
+from sc.utils import quantize_matrices, quantize_color_transforms
+
+
+
+class TransformArray:
+    # Row layout, rows are converted from tag data and objects by subclasses
+    tag: int = 0
+    columns: int = 0
+    dtype: str = None
+    default: tuple = ()
+    
+    def __init__(self, count: int = 0) -> None:
+        self._values = np.empty((count, self.columns), self.dtype)
+        self._values[:] = self.default
+        self._count = count
+
+        # Same row is always given out as the same object, so lists and frames can compare them by identity
+        self._items: list = [None] * count
+        self._appended: list = []
+    
+    @property
+    def values(self):
+        return self._values[:self._count]
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError("TransformArray index out of range")
+
+        item = self._items[index]
+        if item is None:
+            item = self.view(index)
+            self._items[index] = item
+
+        return item
+    
+    def __setitem__(self, index: int, item):
+        self[index] # range check
+        self._values[index] = self.row(item)
+    
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+    
+    def __contains__(self, item):
+        try:
+            self.index(item)
+        except ValueError:
+            return False
+
+        return True
+    
+    def index(self, item):
+        if isinstance(item, TransformView) and item._array is self:
+            return item._index
+
+        for index, value in enumerate(self._items):
+            if value is item:
+                return index
+
+        raise ValueError("Transform is not in TransformArray")
+    
+    def append(self, item):
+        self._reserve(1)
+
+        # Appended object is given back as it is, its row only keeps a copy of values
+        self._values[self._count] = self.row(item)
+        self._items.append(item)
+        self._appended.append(self._count)
+        self._count += 1
+    
+    def take(self, source, indexes: np.ndarray, taken: dict, values: dict = None) -> np.ndarray:
+        # Rows of other array are copied only once, taken keeps where they went
+        if source is self:
+            return indexes
+        
+        key = id(self), id(source)
+        if key not in taken:
+            taken[key] = self, source, np.full(len(source), -1, np.int64)
+        
+        rows = taken[key][2]
+
+        # New rows go in order of first use, like objects appended one by one
+        new, first = np.unique(indexes[rows[indexes] < 0], return_index=True)
+        new = new[np.argsort(first)]
+
+        if values is not None:
+            # Rows with the same saved values as earlier rows point to them, like deduplicated objects
+            copied = []
+            for row, row_key in zip(new.tolist(), map(tuple, self.encode(source.values[new]).tolist())):
+                rows[row] = values.setdefault(row_key, self._count + len(copied))
+                if rows[row] == self._count + len(copied):
+                    copied.append(row)
+            
+            new = np.array(copied, np.int64)
+        else:
+            rows[new] = np.arange(self._count, self._count + len(new))
+
+        self._reserve(len(new))
+        self._values[self._count:self._count + len(new)] = source.values[new]
+        self._items += [None] * len(new)
+        self._count += len(new)
+
+        return rows[indexes]
+    
+    def save(self) -> bytes:
+        # Appended objects could be changed after append, so their rows are taken again
+        for index in self._appended:
+            self._values[index] = self.row(self._items[index])
+        
+        # Every row is saved as a tag, all of them are built at once
+        data = self.encode(self.values)
+
+        tags = np.empty(self._count, [("tag", "u1"), ("length", "<u4"), ("data", data.dtype, data.shape[1:])])
+        tags["tag"] = self.tag
+        tags["length"] = data.itemsize * data.shape[1]
+        tags["data"] = data
+
+        return tags.tobytes()
+    
+    def _reserve(self, count: int):
+        if self._count + count <= len(self._values):
+            return
+        
+        values = np.empty((max(self._count * 2, self._count + count, 16), self.columns), self.dtype)
+        values[:self._count] = self._values[:self._count]
+        self._values = values
+
+
+class TransformView:
+    def __init__(self, tag: int, array: TransformArray, index: int) -> None:
+        Tag.__init__(self, tag)
+
+        self._array = array
+        self._index = index
+
+
+class MatrixView(TransformView, Matrix2x3):
+    @property
+    def matrix(self):
+        # Rows are kept as [[a, b, x], [c, d, y]], so writes to the matrix go right into array
+        return self._array._values[self._index].reshape(2, 3)
+    
+    @matrix.setter
+    def matrix(self, matrix: list):
+        self._array._values[self._index] = np.ravel(matrix)
+
+
+class ColorTransformView(TransformView, ColorTransform):
+    @property
+    def addition(self):
+        return self._array._values[self._index, :4]
+    
+    @addition.setter
+    def addition(self, addition: list):
+        self._array._values[self._index, :4] = addition
+    
+    @property
+    def multiplier(self):
+        return self._array._values[self._index, 4:]
+    
+    @multiplier.setter
+    def multiplier(self, multiplier: list):
+        self._array._values[self._index, 4:] = multiplier
+
+
+class MatrixArray(TransformArray):
+    tag = 8
+    columns = 6
+    dtype = "float64"
+    default = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+    
+    def load(self, buffer: bytes, offset: int, stride: int, start: int, count: int):
+        # Tag data is scale x, rotation x, rotation y, scale y, x, y
+        data = np.ndarray((count, 6), "<i4", buffer, offset, (stride, 4))
+        self._values[start:start + count] = data[:, (0, 1, 4, 2, 3, 5)] / (1024, 1024, 20, 1024, 1024, 20)
+    
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        return quantize_matrices(values)
+    
+    def view(self, index: int):
+        return MatrixView(self.tag, self, index)
+    
+    def row(self, item: Matrix2x3) -> tuple:
+        return (*item.matrix[0], *item.matrix[1])
+
+
+class ColorTransformArray(TransformArray):
+    tag = 9
+    columns = 7
+    dtype = "uint8"
+    default = (0, 0, 0, 255, 0, 0, 0)
+    
+    def load(self, buffer: bytes, offset: int, stride: int, start: int, count: int):
+        # Tag data is addition in BGRA and multiplier in BGR
+        data = np.ndarray((count, 7), "u1", buffer, offset, (stride, 1))
+        self._values[start:start + count] = data[:, (2, 1, 0, 3, 6, 5, 4)]
+    
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        return quantize_color_transforms(values)
+    
+    def view(self, index: int):
+        return ColorTransformView(self.tag, self, index)
+    
+    def row(self, item: ColorTransform) -> tuple:
+        return (*item.addition, *item.multiplier)
\ No newline at end of file
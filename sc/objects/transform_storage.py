@@ -2,6 +2,7 @@ from .tag import Tag
 
 from .matrix import Matrix2x3
 from .color_transform import ColorTransform
+from .transform_array import MatrixArray, ColorTransformArray
 
 
 
@@ -12,14 +13,18 @@ class TransformStorage(Tag):
         self.matrices: list = []
         self.color_transforms: list = []
     
-    def load(self, data: bytes):
+    def load(self, data: bytes, compact: bool = False):
         super().load(data)
 
         matrices_count = self.read_unsigned_short()
         color_transforms_count = self.read_unsigned_short()
 
-        self.matrices = [_cls() for _cls in [Matrix2x3] * matrices_count]
-        self.color_transforms = [_cls() for _cls in [ColorTransform] * color_transforms_count]
+        if compact:
+            self.matrices = MatrixArray(matrices_count)
+            self.color_transforms = ColorTransformArray(color_transforms_count)
+        else:
+            self.matrices = [_cls() for _cls in [Matrix2x3] * matrices_count]
+            self.color_transforms = [_cls() for _cls in [ColorTransform] * color_transforms_count]
     
     def save(self):
         super().save()
@@ -1,9 +1,17 @@
 import os
+import gc
+import pickle
+import asyncio
+import functools
+import threading
+import numpy as np
+from typing import NamedTuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
 from sc_compression.signatures import Signatures
-from sc_compression import Decompressor, Compressor
+from sc_compression import Decompressor
 
-from sc.utils import Reader, Writer
+from sc.utils import Reader, Writer, DecompressedStream, LazyList, FileCache, SCCompressor
 
 from .objects import (
     Tag,
@@ -16,11 +24,43 @@ from .objects import (
     TransformStorage,
     Matrix2x3,
     ColorTransform,
+    TransformArray,
+    MatrixArray,
+    ColorTransformArray,
     MovieClip
 )
+from .objects.texture import decode_image
+from .objects.transform_array import TransformView
 
 
 
+class SWFInfo(NamedTuple):
+    shapes_count: int
+    movie_clips_count: int
+    textures_count: int
+    text_fields_count: int
+    matrices_count: int
+    color_transforms_count: int
+
+    # (export id, export name) pairs
+    exports: tuple
+
+
+class TagEntry(NamedTuple):
+    tag: int
+
+    # Position of tag data in decompressed file
+    offset: int
+    length: int
+
+
+# Tag and length before every tag data
+TAG_HEADER = np.dtype([("tag", "u1"), ("length", "<u4")])
+
+# Part of cache keys of pickled objects, raised whenever attributes of pickled classes change
+PICKLE_FORMAT = 2
+
+
 class SupercellSWF:
     def __init__(self) -> None:
         self.reader: Reader = None
@@ -35,10 +75,40 @@ class SupercellSWF:
         self._transforms: list = []
         self._movie_clips: list = []
 
+        # Indexes for lookups by id and name
+        self._objects: dict = {}
+        self._exports_by_id: dict = {}
+        self._exports_by_name: dict = {}
+
+        self._tag_table: list = []
+        self._loaded_entries: dict = {}
+
+        # Transforms of compact objects are kept in arrays
+        self._compact: bool = False
+        self._taken_transforms: dict = {}
+
+        # Identity indexes of lists and movie clips visited while objects are collected
+        self._identity_indexes: dict = {}
+        self._visited_clips: set = set()
+
+        # Indexes of saved transform values, only while transforms are deduplicated on save
+        self._value_indexes: dict = None
+
         self.use_highres_assets: bool = False
         self.use_lowres_assets: bool = False
         self.external_texture_file: bool = False
 
+    def __getstate__(self):
+        # Reader and writer hold file content only while loading and saving
+        state = self.__dict__.copy()
+        state["reader"] = None
+        state["writer"] = None
+
+        # Table is pickled as array, tuples are much slower to pickle and unpickle
+        state["_tag_table"] = np.array(self.tag_table, np.int64).reshape(-1, 3)
+
+        return state
+    
     @property
     def exports(self):
         return self._exports
@@ -67,34 +137,33 @@ class SupercellSWF:
     def movie_clips(self):
         return self._movie_clips
     
+    @property
+    def tag_table(self):
+        # Table of cached load is turned back into entries only when it's needed
+        if isinstance(self._tag_table, np.ndarray):
+            self._tag_table = [TagEntry(*entry) for entry in self._tag_table.tolist()]
+        
+        return self._tag_table
+    
     def get_export_by_id(self, export_id: int):
-        for export in self.exports:
-            if export.export_id == export_id:
-                return self.get_object_by_id(export_id)
+        if export_id in self._exports_by_id:
+            return self.get_object_by_id(export_id)
 
     def get_export_by_name(self, export_name: str):
-        for export in self.exports:
-            if export.name == export_name:
-                return self.get_object_by_id(export.export_id)
+        export = self._exports_by_name.get(export_name)
+        if export is not None:
+            return self.get_object_by_id(export.export_id)
 
     def get_object_by_id(self, export_id: int):
-        for modifier in self.movie_clip_modifiers:
-            if modifier.export_id == export_id:
-                return modifier
-        
-        for shape in self.shapes:
-            if shape.export_id == export_id:
-                return shape
-        
-        for text_field in self.text_fields:
-            if text_field.export_id == export_id:
-                return text_field
+        obj = self._objects.get(export_id)
+        if obj is None:
+            raise TypeError(f"Can't find object with {export_id}!")
         
-        for movie_clip in self.movie_clips:
-            if movie_clip.export_id == export_id:
-                return movie_clip
+        if isinstance(obj, TagEntry):
+            obj = self._load_entry(obj)
+            self._objects[export_id] = obj
         
-        raise TypeError(f"Can't find object with {export_id}!")
+        return obj
     
     def create_export(self, movie_clip: MovieClip, name: str):
         export = Export()
@@ -103,85 +172,238 @@ class SupercellSWF:
         export.name = name
 
         self._exports.append(export)
-        self._create_object(movie_clip)
+        self._index_export(export)
+        self._create_objects([movie_clip])
+    
+    def _index_export(self, export: Export):
+        # First export with the same id or name is found, like in exports list
+        self._exports_by_id.setdefault(export.export_id, export)
+        self._exports_by_name.setdefault(export.name, export)
+    
+    def _index_object(self, obj: Tag):
+        self._objects.setdefault(obj.export_id, obj)
+    
+    def _create_objects(self, objects: list, deduplicate: bool = False):
+        # Lists are checked by identity indexes that are valid only while objects are collected
+        self._identity_indexes.clear()
+        self._visited_clips.clear()
+        self._value_indexes = {} if deduplicate else None
+
+        try:
+            for obj in objects:
+                self._create_object(obj)
+        finally:
+            # Rows taken from old transform arrays aren't needed after transforms are built
+            self._taken_transforms.clear()
+            self._visited_clips.clear()
+            self._value_indexes = None
+
+            # Deduplicated transforms are found only by identity indexes, so save keeps them until movie clips are written
+            if not deduplicate:
+                self._identity_indexes.clear()
     
     def _create_object(self, obj: Tag):
+        if isinstance(obj, (MovieClipModifier, Shape, TextField, MovieClip)):
+            self._index_object(obj)
+        
         if isinstance(obj, MovieClipModifier):
-            if obj not in self.movie_clip_modifiers:
-                self._movie_clip_modifiers.append(obj)
+            self._append_new(self._movie_clip_modifiers, obj)
         
         elif isinstance(obj, Shape):
-            if obj not in self.shapes:
-                self._shapes.append(obj)
+            self._append_new(self._shapes, obj)
             
             for bitmap in obj.bitmaps:
-                if bitmap.texture not in self.textures:
-                    self._textures.append(bitmap.texture)
+                self._append_new(self._textures, bitmap.texture)
         
         elif isinstance(obj, TextField):
-            if obj not in self.text_fields:
-                self._text_fields.append(obj)
+            self._append_new(self._text_fields, obj)
         
         elif isinstance(obj, MovieClip):
-            if obj not in self.movie_clips:
-                self._movie_clips.append(obj)
+            # Clip that is bound in many places is collected only once
+            if id(obj) in self._visited_clips:
+                return
+            
+            self._visited_clips.add(id(obj))
+            self._append_new(self._movie_clips, obj)
             
             for bind in obj.binds:
                 self._create_object(bind)
             
             transform_storage_id = None
-            for transform_storage in self.transforms:
+            for i, transform_storage in enumerate(self.transforms):
                 if transform_storage.has_avaible:
                     if transform_storage.avaible_matrices > obj.matrices_count and transform_storage.avaible_color_transforms > obj.color_transforms_count:
-                        transform_storage_id = self.transforms.index(transform_storage)
+                        transform_storage_id = i
                         break
             
             if transform_storage_id is None:
                 transform_storage = TransformStorage()
+                if self._compact:
+                    transform_storage.matrices = MatrixArray()
+                    transform_storage.color_transforms = ColorTransformArray()
+
                 self._transforms.append(transform_storage)
-                transform_storage_id = self.transforms.index(transform_storage)
+                transform_storage_id = len(self.transforms) - 1
             
             obj.transform_storage_id = transform_storage_id
+
+            matrices = self.transforms[transform_storage_id].matrices
+            color_transforms = self.transforms[transform_storage_id].color_transforms
+
+            matrix_values = self._value_index(matrices)
+            color_transform_values = self._value_index(color_transforms)
+
+            if obj.compact:
+                if isinstance(matrices, MatrixArray):
+                    obj.take_transforms(self.transforms[transform_storage_id], self._taken_transforms, matrix_values, color_transform_values)
+                    return
+                
+                # Compact frames can only point to compact transform storage
+                obj.expand_frames()
             
             for frame in obj.frames:
-                for bind_id in frame.resources:
-                    matrix = frame.resources[bind_id]["matrix"]
-                    color_transform = frame.resources[bind_id]["color_transform"]
-
-                    if matrix:
-                        if matrix not in self.transforms[transform_storage_id].matrices:
-                            self._transforms[transform_storage_id].matrices.append(matrix)
+                for resource in frame.resources.values():
+                    if resource["matrix"]:
+                        self._append_new(matrices, resource["matrix"], matrix_values)
                     
-                    if color_transform:
-                        if color_transform not in self.transforms[transform_storage_id].color_transforms:
-                            self._transforms[transform_storage_id].color_transforms.append(color_transform)
+                    if resource["color_transform"]:
+                        self._append_new(color_transforms, resource["color_transform"], color_transform_values)
+    
+    def _identity_index(self, items) -> dict:
+        index = self._identity_indexes.get(id(items))
+        if index is None:
+            if isinstance(items, TransformArray):
+                # Views of array are found by their array, only appended and already given out items are indexed
+                index = {id(item): i for i, item in enumerate(items._items) if item is not None}
+            else:
+                # Entries of lazy lists aren't loaded to be indexed, but ones loaded through another list or index are found as their objects
+                slots = items.slots() if isinstance(items, LazyList) else items
+                
+                # First one wins, like in list.index
+                index = dict(zip(map(id, reversed(slots)), range(len(items) - 1, -1, -1)))
+            
+            self._identity_indexes[id(items)] = index
+        
+        return index
+    
+    def _index_of(self, items, item) -> int:
+        if isinstance(item, TransformView) and item._array is items:
+            return item._index
+        
+        index = self._identity_index(items).get(id(item))
+        if index is None:
+            raise ValueError(f"{type(item).__name__} is not in list")
+        
+        return index
+    
+    def _value_index(self, items) -> dict:
+        if self._value_indexes is None:
+            return None
+        
+        return self._value_indexes.setdefault(id(items), {})
+    
+    def _append_new(self, items, item, values: dict = None):
+        try:
+            self._index_of(items, item)
+        except ValueError:
+            index = len(items)
+
+            # Transform with the same saved values as one in list points to it instead of being saved again
+            if values is not None:
+                index = values.setdefault(item.key(), index)
+            
+            self._identity_index(items)[id(item)] = index
 
-    def load(self, fp: str, load_texture_file: bool = True):
-        decompressor = Decompressor()
-        content = decompressor.decompress(open(fp, 'rb').read())
-        self.reader = Reader(content)
+            if index == len(items):
+                items.append(item)
 
-        is_texture_file = os.path.basename(fp).endswith("_tex.sc")
+    @staticmethod
+    def read_info(fp: str) -> SWFInfo:
+        if os.path.basename(fp).endswith("_tex.sc"):
+            raise TypeError("Texture file has no header!")
 
-        if is_texture_file:
-            # Loading texture file
+        # Only the beginning of file is decompressed, tags and texture file aren't touched
+        with DecompressedStream(fp, 1 << 12) as stream:
+            header = Reader(stream.read(19))
+
+            counts = [header.read_unsigned_short() for x in range(6)]
+            header.read(5) # unused
+
+            exports_count = header.read_unsigned_short()
+
+            export_ids = Reader(stream.read(exports_count * 2))
+            export_ids = [export_ids.read_unsigned_short() for x in range(exports_count)]
+
+            export_names = []
+            for x in range(exports_count):
+                name_length = stream.read(1)[0]
+                export_names.append(stream.read(name_length).decode() if name_length != 0xff else None)
+        
+        return SWFInfo(*counts, tuple(zip(export_ids, export_names)))
+
+    def iter_textures(self, fp: str):
+        # Texture file is read tag by tag, so only the current texture is kept in memory
+        texture_file = SupercellSWF()
+
+        with DecompressedStream(fp) as stream:
             while True:
-                tag = self.reader.read_unsigned_char()
-                length = self.reader.read_unsigned_int()
-                data = self.reader.read(length)
+                header = Reader(stream.read(5))
+                tag = header.read_unsigned_char()
+                length = header.read_unsigned_int()
+                data = stream.read(length)
 
                 if tag == 0:
                     break
 
                 if tag in (1, 16, 19, 24, 27, 28, 29, 34):
                     texture = SWFTexture(tag)
-                    texture.load(data, self)
+                    texture.load(data, texture_file)
 
-                    self._textures.append(texture)
+                    yield texture
 
                 else:
                     raise TypeError(f"Unknown tag in texture file, {tag}")
+
+    def load(self, fp: str, load_texture_file: bool = True, cache_images: bool = True, workers: int = 1, lazy: bool = False, exports: list = None, compact: bool = False, cache: FileCache = None):
+        is_texture_file = os.path.basename(fp).endswith("_tex.sc")
+
+        # Loaded objects are cached only when everything is loaded
+        objects_key = None
+        loaded = None
+        if cache is not None and not lazy and exports is None:
+            texture_fp = os.path.splitext(fp)[0] + "_tex.sc"
+            objects_key = cache.key("objects", PICKLE_FORMAT, fp, texture_fp, load_texture_file, cache_images, compact)
+
+            data = cache.read(objects_key)
+            if data is not None:
+                loaded = unpickle(data)
+
+        if loaded is not None:
+            self.__dict__.update(loaded.__dict__)
+
+        elif is_texture_file:
+            # Loading texture file
+            for texture in self.iter_textures(fp):
+                texture.cache_image = cache_images
+
+                self._textures.append(texture)
         else:
+            # Eager loads cache their objects, content is cached only for loads that still parse (lazy and selective ones)
+            content = None
+            content_key = None
+            if cache is not None and objects_key is None:
+                content_key = cache.key("content", fp)
+                content = cache.read(content_key)
+            
+            if content is None:
+                decompressor = Decompressor()
+                content = decompressor.decompress(open(fp, 'rb').read())
+
+                if content_key is not None:
+                    cache.write(content_key, content)
+
+            self.reader = Reader(content)
+
             # Loading SWF header
             shapes_count = self.reader.read_unsigned_short()
             self._shapes = [_cls() for _cls in [Shape] * shapes_count]
@@ -198,10 +420,16 @@ class SupercellSWF:
             self._transforms = [TransformStorage()]
 
             matrices_count = self.reader.read_unsigned_short()
-            self._transforms[0].matrices = [_cls() for _cls in [Matrix2x3] * matrices_count]
+            if compact:
+                self._transforms[0].matrices = MatrixArray(matrices_count)
+            else:
+                self._transforms[0].matrices = [_cls() for _cls in [Matrix2x3] * matrices_count]
 
             color_transforms_count = self.reader.read_unsigned_short()
-            self._transforms[0].color_transforms = [_cls() for _cls in [ColorTransform] * color_transforms_count]
+            if compact:
+                self._transforms[0].color_transforms = ColorTransformArray(color_transforms_count)
+            else:
+                self._transforms[0].color_transforms = [_cls() for _cls in [ColorTransform] * color_transforms_count]
 
             self._movie_clip_modifiers = []
 
@@ -216,6 +444,31 @@ class SupercellSWF:
             for x in range(exports_count):
                 self._exports[x].name = self.reader.read_ascii()
             
+            self._objects = {}
+            self._exports_by_id = {}
+            self._exports_by_name = {}
+
+            self._tag_table = []
+            self._loaded_entries = {}
+
+            self._compact = compact
+
+            # Selected exports are found from lazily loaded file, so nothing else is parsed
+            if exports is not None:
+                lazy = True
+
+            if lazy:
+                # Objects, matrices and color transforms are parsed when they are accessed first
+                self._shapes = LazyList(self._shapes, self._load_entry, TagEntry, self._loaded_entry)
+                self._text_fields = LazyList(self._text_fields, self._load_entry, TagEntry, self._loaded_entry)
+                self._movie_clips = LazyList(self._movie_clips, self._load_entry, TagEntry, self._loaded_entry)
+
+                if not compact:
+                    self._make_lazy_transforms(self._transforms[0])
+
+            for export in self._exports:
+                self._index_export(export)
+            
             # Loading tags
 
             texture_id = 0
@@ -237,6 +490,10 @@ class SupercellSWF:
             while True:
                 tag = self.reader.read_unsigned_char()
                 length = self.reader.read_unsigned_int()
+
+                entry = TagEntry(tag, self.reader.tell(), length)
+                self._tag_table.append(entry)
+
                 data = self.reader.read(length)
 
                 if tag == 0:
@@ -248,10 +505,10 @@ class SupercellSWF:
                 elif tag == 26:
                     self.external_texture_file = True
 
-                    if load_texture_file:
+                    if load_texture_file and exports is None:
                         texture_fp = os.path.splitext(fp)[0] + "_tex.sc"
                         texture_file = SupercellSWF()
-                        texture_file.load(texture_fp)
+                        texture_file.load(texture_fp, cache_images=cache_images, workers=workers)
 
                         if len(self.textures) != len(texture_file.textures):
                             raise TypeError("Bad textures count in texture file!")
@@ -261,6 +518,7 @@ class SupercellSWF:
 
                 elif tag in (1, 16, 19, 24, 27, 28, 29, 34):
                     texture = SWFTexture(tag)
+                    texture.cache_image = cache_images
                     texture.load(data, self)
 
                     if texture_file is None:
@@ -277,27 +535,26 @@ class SupercellSWF:
                 elif tag in (38, 39, 40):
                     modifier = MovieClipModifier(tag)
                     modifier.load(data)
+                    modifier._snapshot = modifier.snapshot(self)
 
+                    self._index_object(modifier)
                     self._movie_clip_modifiers[loaded_modifiers] = modifier
                     loaded_modifiers += 1
 
                 elif tag in (2, 18):
-                    shape = Shape(tag)
-                    shape.load(data, self)
-
-                    self._shapes[loaded_shapes] = shape
+                    self._shapes[loaded_shapes] = self._load_object(entry, lazy)
                     loaded_shapes += 1
 
                 elif tag in (7, 15, 20, 21, 25, 33, 44):
-                    text_field = TextField(tag)
-                    text_field.load(data)
-
-                    self._text_fields[loaded_text_fields] = text_field
+                    self._text_fields[loaded_text_fields] = self._load_object(entry, lazy)
                     loaded_text_fields += 1
 
                 elif tag == 42:
                     transform_storage = TransformStorage(tag)
-                    transform_storage.load(data)
+                    transform_storage.load(data, compact)
+
+                    if lazy and not compact:
+                        self._make_lazy_transforms(transform_storage)
 
                     self._transforms.append(transform_storage)
 
@@ -306,137 +563,403 @@ class SupercellSWF:
                     color_transform_id = 0
 
                 elif tag == 8:
-                    matrix = Matrix2x3(tag)
-                    matrix.load(data)
-
-                    self._transforms[transform_storage_id].matrices[matrix_id] = matrix
-                    matrix_id += 1
+                    if compact:
+                        matrix_id += self._read_transforms(entry, self._transforms[transform_storage_id].matrices, matrix_id)
+                    else:
+                        self._transforms[transform_storage_id].matrices[matrix_id] = entry if lazy else self._parse_entry(entry)
+                        matrix_id += 1
 
                 elif tag == 9:
-                    color_transform = ColorTransform(tag)
-                    color_transform.load(data)
-
-                    self._transforms[transform_storage_id].color_transforms[color_transform_id] = color_transform
-                    color_transform_id += 1
+                    if compact:
+                        color_transform_id += self._read_transforms(entry, self._transforms[transform_storage_id].color_transforms, color_transform_id)
+                    else:
+                        self._transforms[transform_storage_id].color_transforms[color_transform_id] = entry if lazy else self._parse_entry(entry)
+                        color_transform_id += 1
 
                 elif tag in (3, 10, 12, 14, 35):
-                    movie_clip = MovieClip(tag)
-                    movie_clip.load(data, self)
-
-                    self._movie_clips[loaded_movie_clips] = movie_clip
+                    self._movie_clips[loaded_movie_clips] = self._load_object(entry, lazy)
                     loaded_movie_clips += 1
 
                 else:
                     raise TypeError(f"Unknown tag in SWF file, {tag}")
+            
+            if exports is not None:
+                textures = self._textures
+                self._select_exports(exports)
 
-    def save(self, fp: str, save_texture_file: bool = True):
-        compressor = Compressor()
-        self.writer = Writer()
+                if self.external_texture_file and load_texture_file:
+                    self._load_selected_textures(os.path.splitext(fp)[0] + "_tex.sc", textures, cache_images)
+        
+        if objects_key is not None and loaded is None:
+            cache.write(objects_key, pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+        
+        if workers > 1 and cache_images:
+            self._decode_textures(workers)
+    
+    def _select_exports(self, names: list):
+        exports = []
+        for name in names:
+            export = self._exports_by_name.get(name)
+            if export is None:
+                raise TypeError(f"Can't find export with name {name}!")
+            
+            if export not in exports:
+                exports.append(export)
+        
+        # Movie clips get their binds with get_object_by_id, so only the dependency closure is parsed
+        objects = [self.get_object_by_id(export.export_id) for export in exports]
 
-        is_texture_file = os.path.basename(fp).endswith("_tex.sc")
+        # Every selected object was parsed from its entry, offsets give back the file order
+        offsets = {id(obj): offset for offset, obj in self._loaded_entries.items()}
+
+        self._exports = exports
+
+        self._textures = []
+        self._movie_clip_modifiers = []
+        self._shapes = []
+        self._text_fields = []
+        self._transforms = []
+        self._movie_clips = []
+
+        self._objects = {}
+        self._exports_by_id = {}
+        self._exports_by_name = {}
+        self._loaded_entries = {}
 
-        if is_texture_file:
-            # Saving texture file
-            for texture in self.textures:
-                texture.save(self)
+        for export in self._exports:
+            self._index_export(export)
+        
+        # Lists, textures and transforms are built again from selected objects, like on save
+        self._create_objects(objects)
 
-                self.writer.write_unsigned_char(texture.tag)
-                self.writer.write_unsigned_int(len(texture.buffer))
-                self.writer.write(texture.buffer)
+        # Clips are collected before their binds, but they are loaded in file order, which has binds first
+        self._movie_clips.sort(key=lambda movie_clip: offsets[id(movie_clip)])
+    
+    def _load_selected_textures(self, fp: str, textures: list, cache_images: bool):
+        # Texture file is streamed and only textures of selected shapes are kept
+        selected = {textures.index(texture): texture for texture in self.textures}
+        loaded = {}
+
+        textures_count = 0
+        for texture in self.iter_textures(fp):
+            if textures_count in selected:
+                texture.cache_image = cache_images
+                loaded[selected[textures_count]] = texture
             
-            self.writer.write(bytes(5))
+            textures_count += 1
+        
+        if textures_count != len(textures):
+            raise TypeError("Bad textures count in texture file!")
+        
+        self._textures = [loaded[texture] for texture in self.textures]
+
+        for shape in self.shapes:
+            for bitmap in shape.bitmaps:
+                bitmap.texture = loaded[bitmap.texture]
+    
+    def _read_transforms(self, entry: TagEntry, array, start: int) -> int:
+        # Matrices and color transforms come in runs of same tags, so a run is read at once as strided array
+        stride = entry.length + 5
+        offset = entry.offset - 5
+        buffer = self.reader.buffer
+
+        limit = min(len(array) - start, (len(buffer) - offset) // stride)
+        headers = np.ndarray((max(limit, 0),), TAG_HEADER, buffer, offset, (stride,))
+
+        run = (headers["tag"] == entry.tag) & (headers["length"] == entry.length)
+        count = limit if run.all() else int(run.argmin())
+        if count < 1:
+            raise TypeError("Bad transforms count in SWF file!")
+
+        array.load(buffer, entry.offset, stride, start, count)
+
+        self._tag_table += [TagEntry(entry.tag, entry.offset + x * stride, entry.length) for x in range(1, count)]
+        self.reader.read((count - 1) * stride)
+
+        return count
+    
+    def _make_lazy_transforms(self, transform_storage: TransformStorage):
+        transform_storage.matrices = LazyList(transform_storage.matrices, self._load_entry, TagEntry, self._loaded_entry)
+        transform_storage.color_transforms = LazyList(transform_storage.color_transforms, self._load_entry, TagEntry, self._loaded_entry)
+    
+    def _load_object(self, entry: TagEntry, lazy: bool):
+        if lazy:
+            # Export id is the first field of every object, so it is indexed without parsing
+            export_id = int.from_bytes(self.reader.buffer[entry.offset:entry.offset + 2], "little")
+            self._objects.setdefault(export_id, entry)
+
+            return entry
+        
+        obj = self._parse_entry(entry)
+        self._index_object(obj)
+
+        return obj
+    
+    def _load_entry(self, entry: TagEntry):
+        # Same object is given to lists and index, whichever accesses it first
+        obj = self._loaded_entries.get(entry.offset)
+        if obj is None:
+            obj = self._parse_entry(entry)
+            self._loaded_entries[entry.offset] = obj
+        
+        return obj
+    
+    def _loaded_entry(self, entry: TagEntry):
+        # Object of entry if it was already loaded, nothing is parsed here
+        return self._loaded_entries.get(entry.offset, entry)
+    
+    def _parse_entry(self, entry: TagEntry):
+        data = self.reader.buffer[entry.offset:entry.offset + entry.length]
+
+        if entry.tag in (2, 18):
+            obj = Shape(entry.tag)
+            obj.load(data, self)
+        
+        elif entry.tag in (7, 15, 20, 21, 25, 33, 44):
+            obj = TextField(entry.tag)
+            obj.load(data)
+        
+        elif entry.tag == 8:
+            obj = Matrix2x3(entry.tag)
+            obj.load(data)
+        
+        elif entry.tag == 9:
+            obj = ColorTransform(entry.tag)
+            obj.load(data)
+        
         else:
-            self._movie_clip_modifiers.clear()
-            self._shapes.clear()
-            self._text_fields.clear()
-            self._transforms.clear()
-
-            # Saving SWF header
-            for movie_clip in self.movie_clips:
-                self._create_object(movie_clip)
-            
-            self.writer.write_unsigned_short(len(self.shapes))
-            self.writer.write_unsigned_short(len(self.movie_clips))
-            self.writer.write_unsigned_short(len(self.textures))
-            self.writer.write_unsigned_short(len(self.text_fields))
+            obj = MovieClip(entry.tag)
+            obj.load(data, self, self._compact)
+        
+        # Only tags that kept loaded bytes can be saved without building them again
+        if obj._view is not None:
+            obj._snapshot = obj.snapshot(self)
 
-            if not self.transforms:
-                self._transforms.append(TransformStorage())
-            
-            self.writer.write_unsigned_short(len(self.transforms[0].matrices))
-            self.writer.write_unsigned_short(len(self.transforms[0].color_transforms))
+        return obj
+    
+    def _decode_textures(self, workers: int):
+        # Textures of texture file are already decoded when it was loaded with the same workers
+        textures = [texture for texture in self.textures if isinstance(texture, SWFTexture) and texture._data is not None and texture._decoded is None]
+        if not textures:
+            return
+        
+        # Results come back in submit order, so the first broken texture is always the one that raises
+        with ProcessPoolExecutor(min(workers, len(textures))) as executor:
+            images = executor.map(
+                decode_image,
+                [bytes(texture._data) for texture in textures],
+                *zip(*[texture._data_header for texture in textures])
+            )
+
+            # Images only go to decode cache, so untouched textures are saved as they were loaded
+            for texture, image in zip(textures, images):
+                texture._decoded = image
+
+    def save(self, fp: str, save_texture_file: bool = True, signature: Signatures = Signatures.SC, file_version: int = 1, level: int = None, threads: int = 0, deduplicate_transforms: bool = True):
+        # Signatures.NONE writes uncompressed data, SC version 3 and ZSTD are Zstandard, others are LZMA
+        compressor = SCCompressor(level, threads)
+        self.writer = Writer()
 
-            self.writer.write(bytes(5)) # unused
+        texture_saving = None
 
-            self.writer.write_unsigned_short(len(self.exports))
+        # Texture file is saved in a separate thread, so both files are built and compressed at the same time
+        with ThreadPoolExecutor(1) as executor:
+            is_texture_file = os.path.basename(fp).endswith("_tex.sc")
 
-            for export in self.exports:
-                self.writer.write_unsigned_short(export.export_id)
-            
-            for export in self.exports:
-                self.writer.write_ascii(export.name)
-            
-            # Saving tags
-            
-            def write_object(obj):
-                self.writer.write_unsigned_char(obj.tag)
-                self.writer.write_unsigned_int(len(obj.buffer))
-                self.writer.write(obj.buffer)
-            
-            if self.use_highres_assets:
-                write_object(Tag(23))
-            
-            if self.external_texture_file:
-                write_object(Tag(26))
+            if is_texture_file:
+                # Saving texture file
+                for texture in self.textures:
+                    self.writer.write_tag(texture, self)
+                
+                self.writer.write(bytes(5))
+            else:
+                # Lazily loaded movie clips need the objects and transforms they are parsed from
+                self._movie_clips = list(self.movie_clips)
+
+                self._movie_clip_modifiers.clear()
+                self._shapes.clear()
+                self._text_fields.clear()
+                self._transforms.clear()
+                self._objects.clear()
+
+                # Saving SWF header
+                self._create_objects(self.movie_clips, deduplicate_transforms)
+                
+                self.writer.write_unsigned_short(len(self.shapes))
+                self.writer.write_unsigned_short(len(self.movie_clips))
+                self.writer.write_unsigned_short(len(self.textures))
+                self.writer.write_unsigned_short(len(self.text_fields))
+
+                if not self.transforms:
+                    self._transforms.append(TransformStorage())
+                
+                self.writer.write_unsigned_short(len(self.transforms[0].matrices))
+                self.writer.write_unsigned_short(len(self.transforms[0].color_transforms))
 
-                if save_texture_file:
+                self.writer.write(bytes(5)) # unused
+
+                self.writer.write_unsigned_short(len(self.exports))
+
+                for export in self.exports:
+                    self.writer.write_unsigned_short(export.export_id)
+                
+                for export in self.exports:
+                    self.writer.write_ascii(export.name)
+                
+                # Saving tags
+                
+                def save_object(obj, *args):
+                    # Tags that didn't change since load keep their bytes, released tags have nothing to compare
+                    if obj._snapshot is not None and obj.snapshot(self) == obj._snapshot:
+                        self.writer.write_unsigned_char(obj.tag)
+                        self.writer.write_unsigned_int(len(obj.buffer))
+                        self.writer.write(obj.buffer)
+                    else:
+                        # Saved tag doesn't keep its bytes, so it is saved again next time
+                        self.writer.write_tag(obj, *args)
+                        obj._snapshot = None
+                
+                if self.use_highres_assets:
+                    self.writer.write_tag(Tag(23))
+                
+                if self.external_texture_file:
+                    self.writer.write_tag(Tag(26))
+                
+                if self.use_lowres_assets:
+                    self.writer.write_tag(Tag(30))
+                
+                for texture in self.textures:
+                    self.writer.write_tag(texture, self)
+                
+                # Started only after texture tags are written here, so both threads never save the same texture
+                if self.external_texture_file and save_texture_file:
                     texture_fp = os.path.splitext(fp)[0] + "_tex.sc"
                     texture_file = SupercellSWF()
                     texture_file._textures = self._textures
-                    texture_file.save(texture_fp)
-            
-            if self.use_lowres_assets:
-                write_object(Tag(30))
-            
-            for texture in self.textures:
-                texture.save(self)
-                write_object(texture)
-            
-            if self.movie_clip_modifiers:
-                modifiers = MovieClipModifiers()
-                modifiers.save(self)
-                write_object(modifiers)
-            
-            for modifier in self.movie_clip_modifiers:
-                modifier.save()
-                write_object(modifier)
-            
-            for shape in self.shapes:
-                shape.save(self)
-                write_object(shape)
-            
-            for text_field in self.text_fields:
-                text_field.save()
-                write_object(text_field)
-            
-            for transform_storage in self.transforms:
-                if bool(self.transforms.index(transform_storage)):
-                    transform_storage.save()
-                    write_object(transform_storage)
+
+                    texture_saving = executor.submit(texture_file.save, texture_fp, True, signature, file_version, level, threads)
+                
+                if self.movie_clip_modifiers:
+                    self.writer.write_tag(MovieClipModifiers(), self)
+                
+                for modifier in self.movie_clip_modifiers:
+                    save_object(modifier)
+                
+                for shape in self.shapes:
+                    save_object(shape, self)
+                
+                for text_field in self.text_fields:
+                    save_object(text_field)
                 
-                for matrix in transform_storage.matrices:
-                    matrix.save()
-                    write_object(matrix)
+                for transform_storage in self.transforms:
+                    if bool(self.transforms.index(transform_storage)):
+                        self.writer.write_tag(transform_storage)
+                    
+                    if isinstance(transform_storage.matrices, TransformArray):
+                        self.writer.write(transform_storage.matrices.save())
+                    else:
+                        for matrix in transform_storage.matrices:
+                            save_object(matrix)
+                    
+                    if isinstance(transform_storage.color_transforms, TransformArray):
+                        self.writer.write(transform_storage.color_transforms.save())
+                    else:
+                        for color_transform in transform_storage.color_transforms:
+                            save_object(color_transform)
+                
+                # Movie clips find ids of their transforms by identity indexes, they are built once for all clips
+                try:
+                    for movie_clip in self.movie_clips:
+                        self.writer.write_tag(movie_clip, self)
+                finally:
+                    self._identity_indexes.clear()
                 
-                for color_transform in transform_storage.color_transforms:
-                    color_transform.save()
-                    write_object(color_transform)
+                self.writer.write(bytes(5))
+
+            open(fp, 'wb').write(compressor.compress(self.writer.buffer, signature, file_version))
+
+        if texture_saving is not None:
+            texture_saving.result()
+    
+    @classmethod
+    async def aload(cls, fp: str, executor: Executor = None, **kwargs):
+        # Whole load runs in executor, default executor of event loop is used if it's None
+        loop = asyncio.get_running_loop()
+
+        # Cancelled load goes on in executor, but the new object is only dropped, nothing else is touched
+        if isinstance(executor, ProcessPoolExecutor):
+            # Lazy lists are parsed whole to be pickled, so lazy load in another process would be a full load
+            if kwargs.get("lazy"):
+                raise TypeError("Lazy load can't be sent back from another process!")
             
-            for movie_clip in self.movie_clips:
-                movie_clip.save(self)
-                write_object(movie_clip)
+            # Loaded objects come back as bytes, they are unpickled without garbage collector passes and off the loop
+            data = await loop.run_in_executor(executor, functools.partial(load_file, fp, True, **kwargs))
+            return await loop.run_in_executor(None, unpickle, data)
+        
+        return await loop.run_in_executor(executor, functools.partial(load_file, fp, **kwargs))
+    
+    @classmethod
+    async def aload_many(cls, paths: list, concurrency: int = 4, executor: Executor = None, return_exceptions: bool = False, **kwargs) -> list:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(fp: str):
+            async with semaphore:
+                return await cls.aload(fp, executor, **kwargs)
+        
+        tasks = [asyncio.ensure_future(load(fp)) for fp in paths]
+
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            # Files that didn't start yet aren't loaded for nothing when one fails or all are cancelled
+            for task in tasks:
+                task.cancel()
             
-            self.writer.write(bytes(5))
+            raise
+    
+    async def asave(self, fp: str, executor: Executor = None, **kwargs):
+        loop = asyncio.get_running_loop()
+        saving = loop.run_in_executor(executor, functools.partial(self.save, fp, **kwargs))
+
+        try:
+            await asyncio.shield(saving)
+        except asyncio.CancelledError:
+            # Save can't be stopped halfway, so cancel waits for it, then object can be changed and files are whole
+            await saving
+            raise
+
+
+def load_file(fp: str, pickled: bool = False, **kwargs):
+    swf = SupercellSWF()
+    swf.load(fp, **kwargs)
+
+    if pickled:
+        return pickle.dumps(swf, pickle.HIGHEST_PROTOCOL)
+
+    return swf
 
-        open(fp, 'wb').write(compressor.compress(self.writer.buffer, Signatures.SC, 1))
-        # open(fp, 'wb').write(self.writer.buffer) # for tests in 010 Editor
+
+# Garbage collector is paused while any thread unpickles and started again only after the last one is done
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_enabled = False
+
+
+def unpickle(data: bytes):
+    # Every unpickled object stays alive, so garbage collector passes only slow loading down
+    global _gc_pauses, _gc_enabled
+
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_enabled = gc.isenabled()
+            gc.disable()
+        
+        _gc_pauses += 1
+
+    try:
+        return pickle.loads(data)
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_enabled:
+                gc.enable()
\ No newline at end of file
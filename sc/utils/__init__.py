@@ -1,2 +1,7 @@
 from .reader import Reader
-from .writer import Writer
\ No newline at end of file
+from .writer import Writer
+from .decompressed_stream import DecompressedStream
+from .lazy_list import LazyList
+from .file_cache import FileCache
+from .compressor import SCCompressor
+from .quantize import quantize_matrix, quantize_matrices, quantize_color_transform, quantize_color_transforms
\ No newline at end of file
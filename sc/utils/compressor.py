@@ -0,0 +1,41 @@
+from sc_compression import Compressor
+from sc_compression.signatures import Signatures
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+
+class SCCompressor(Compressor):
+    # Header writing and LZMA filters are internals of sc_compression, so it is pinned in requirements.txt
+    def __init__(self, level: int = None, threads: int = 0) -> None:
+        # Level is LZMA preset (0 - 9) or Zstandard level (1 - 22), None keeps defaults of sc_compression
+        self.level = level
+        self.threads = threads
+
+        if level is not None:
+            # Mode and match finder come from preset, dictionary and literal settings stay the same
+            filters = dict(self.lzma_filters[0])
+            del filters["mode"]
+
+            self.lzma_filters = [{**filters, "preset": level}]
+
+    def compress(self, data: bytes, signature: Signatures, file_version: int = None, metadata: bytes = None) -> bytes:
+        if file_version is None:
+            file_version = 3 if zstandard and signature != Signatures.SCLZ else 1
+
+        is_zstd = signature == Signatures.ZSTD or (signature == Signatures.SC and file_version == 3)
+        if not is_zstd or zstandard is None:
+            # LZMA is a single stream, it can't be split between threads and still be read by the game
+            return super().compress(data, signature, file_version, metadata)
+
+        # Zstandard compresses parts of data in worker threads and joins them into one frame
+        compressor = zstandard.ZstdCompressor(
+            level=self.level if self.level is not None else 3,
+            threads=self.threads
+        )
+        compressed = compressor.compress(data)
+
+        return self._write_header(compressed, data, file_version, signature, metadata)
@@ -0,0 +1,113 @@
+import os
+import lzma
+
+from sc_compression import Decompressor
+from sc_compression.signatures import Signatures, get_signature
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+
+class DecompressedStream:
+    def __init__(self, fp: str, chunk_size: int = 1 << 20) -> None:
+        self.file = open(fp, 'rb')
+        self.chunk_size = chunk_size
+
+        self._buffer = bytearray()
+        self._eof = False
+
+        self._lzma = None
+        self._lzma_header = b""
+        self._zstd = None
+
+        self._open(0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def close(self):
+        if self._zstd is not None:
+            self._zstd.close()
+
+        self.file.close()
+    
+    def _open(self, offset: int):
+        self.file.seek(offset)
+        signature = get_signature(self.file.read(68))
+        self.file.seek(offset)
+
+        if signature == Signatures.SC:
+            self.file.read(2) # magic
+
+            file_version = int.from_bytes(self.file.read(4), "big")
+            if file_version == 4:
+                file_version = int.from_bytes(self.file.read(4), "big")
+
+            if file_version in (0x05000000, 0x06000000):
+                if file_version == 0x06000000:
+                    self.file.read(2)
+
+                metadata_length = int.from_bytes(self.file.read(4), "little")
+                self.file.seek(metadata_length, os.SEEK_CUR)
+            else:
+                hash_length = int.from_bytes(self.file.read(4), "big")
+                self.file.seek(hash_length, os.SEEK_CUR)
+
+            self._open(self.file.tell())
+
+        elif signature == Signatures.SIG:
+            self._open(offset + 68)
+
+        elif signature == Signatures.LZMA:
+            # SC stores a 4 byte size after LZMA properties, lzma module wants 8 bytes
+            header = self.file.read(9)
+
+            self._lzma = lzma.LZMADecompressor()
+            self._lzma_header = header[:5] + b"\xff" * 8
+
+        elif signature == Signatures.ZSTD and zstandard is not None:
+            self._zstd = zstandard.ZstdDecompressor().stream_reader(self.file, closefd=False)
+
+        elif signature != Signatures.NONE:
+            # Can't be decompressed in parts, so the whole content is kept
+            self._buffer = bytearray(Decompressor().decompress(self.file.read()))
+            self._eof = True
+    
+    def _fill(self):
+        if self._lzma is not None:
+            data = b""
+            if self._lzma.needs_input:
+                data = self.file.read(self.chunk_size)
+                if not data:
+                    self._eof = True
+                    return
+
+                data = self._lzma_header + data
+                self._lzma_header = b""
+
+            self._buffer += self._lzma.decompress(data, self.chunk_size)
+            self._eof = self._lzma.eof
+
+        else:
+            if self._zstd is not None:
+                data = self._zstd.read(self.chunk_size)
+            else:
+                data = self.file.read(self.chunk_size)
+
+            self._buffer += data
+            self._eof = not data
+    
+    def read(self, size: int) -> bytes:
+        while len(self._buffer) < size and not self._eof:
+            self._fill()
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+
+        return data
@@ -0,0 +1,75 @@
+import os
+import hashlib
+import tempfile
+
+
+
+class FileCache:
+    def __init__(self, directory: str, max_size: int = 1 << 30) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+        os.makedirs(directory, exist_ok=True)
+    
+    def key(self, *parts) -> str:
+        # Files are known by path, size and modification time, so they aren't read to get a key
+        values = []
+        for part in parts:
+            if isinstance(part, str) and os.path.isfile(part):
+                stat = os.stat(part)
+                values.append(f"{os.path.abspath(part)}:{stat.st_size}:{stat.st_mtime_ns}")
+            else:
+                values.append(repr(part))
+
+        return hashlib.sha1("\n".join(values).encode()).hexdigest()
+    
+    def read(self, key: str) -> bytes:
+        path = os.path.join(self.directory, key)
+
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+            # Modification time marks last use for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return data
+    
+    def write(self, key: str, data: bytes):
+        path = os.path.join(self.directory, key)
+
+        # Written under a unique name first, so readers never see a part of file and writers of the same key don't meet
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with open(handle, 'wb') as file:
+                file.write(data)
+
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self.evict()
+    
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+
+        # Least recently used files are removed first
+        for mtime, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            size -= entry_size
\ No newline at end of file
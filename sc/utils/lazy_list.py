@@ -0,0 +1,79 @@
+import sys
+
+
+
+class LazyList(list):
+    def __init__(self, items: list, load, entry_type: type, loaded=None) -> None:
+        super().__init__(items)
+
+        # Items of entry type are replaced with load(item) when they are accessed first
+        self._load = load
+        self._entry_type = entry_type
+
+        # loaded(item) gives object of entry that was already loaded some other way, or entry itself
+        self._loaded = loaded
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        item = super().__getitem__(index)
+        if isinstance(item, self._entry_type):
+            item = self._load(item)
+            super().__setitem__(index, item)
+        
+        return item
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self[i]
+    
+    def __contains__(self, item):
+        return any(slot is item or slot == item for slot in self.slots())
+    
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        
+        return list(self) == list(other)
+    
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    __hash__ = None
+    
+    def index(self, item, start: int = 0, stop: int = sys.maxsize):
+        # Items are compared without loading entries, like list they are found by identity or equality
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for i, slot in enumerate(self.slots()):
+            if start <= i < stop and (slot is item or slot == item):
+                return i
+        
+        raise ValueError(f"{type(item).__name__} is not in list")
+    
+    def count(self, item):
+        return sum(1 for slot in self.slots() if slot is item or slot == item)
+    
+    def remove(self, item):
+        del self[self.index(item)]
+    
+    def slots(self) -> list:
+        # Items as they are now, entries that are loaded through other lists or indexes are given as their objects
+        slots = list.__iter__(self)
+        if self._loaded is None:
+            return list(slots)
+        
+        return [self._loaded(item) if isinstance(item, self._entry_type) else item for item in slots]
+    
+    def pop(self, index: int = -1):
+        item = self[index]
+        del self[index]
+        return item
+    
+    def copy(self):
+        return self[:]
\ No newline at end of file
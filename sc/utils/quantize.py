@@ -0,0 +1,39 @@
+import numpy as np
+
+
+
+# Transforms are saved as integers, matrices and colors with the same quantized values are saved as the same bytes
+
+# Matrix rows are kept as [a, b, x, c, d, y], they are saved as a, b, c, d in 1/1024 and x, y in twips
+MATRIX_ORDER = (0, 1, 3, 4, 2, 5)
+MATRIX_SCALE = (1024, 1024, 1024, 1024, 20, 20)
+
+# Color transform rows are kept as RGBA addition and RGB multiplier, they are saved as BGRA and BGR
+COLOR_TRANSFORM_ORDER = (2, 1, 0, 3, 6, 5, 4)
+
+
+def quantize_matrix(matrix: list) -> tuple:
+    (a, b, x), (c, d, y) = matrix
+
+    return (
+        int(round(a * 1024)),
+        int(round(b * 1024)),
+        int(round(c * 1024)),
+        int(round(d * 1024)),
+        int(round(x * 20)),
+        int(round(y * 20))
+    )
+
+
+def quantize_matrices(values: np.ndarray) -> np.ndarray:
+    # Rounds half to even like round in quantize_matrix
+    return np.round(values[:, MATRIX_ORDER] * MATRIX_SCALE).astype("<i4")
+
+
+def quantize_color_transform(addition: list, multiplier: list) -> tuple:
+    values = (*addition, *multiplier)
+    return tuple(int(values[i]) for i in COLOR_TRANSFORM_ORDER)
+
+
+def quantize_color_transforms(values: np.ndarray) -> np.ndarray:
+    return values[:, COLOR_TRANSFORM_ORDER]
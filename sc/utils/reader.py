@@ -1,15 +1,38 @@
-from io import BytesIO
+import struct
 
+from .structs import STRUCTS
 
 
-class Reader(BytesIO):
+
+class Reader:
+    # Little endian readers use class structs, so loaded tags don't keep their own
+    endian: str = "little"
+    _structs = STRUCTS["little"]
+
     def __init__(self, buffer: bytes, endian: str = "little") -> None:
-        super().__init__(buffer)
-        self.endian = endian
+        # Reading goes over a view, so nested tags share the parent buffer instead of copying it
+        self._view = memoryview(buffer)
+        self._offset = 0
+
+        if endian != self.endian:
+            self._structs = STRUCTS[endian]
+            self.endian = endian
     
     @property
     def buffer(self):
-        return self.getvalue()
+        return self._view
+    
+    def tell(self) -> int:
+        return self._offset
+    
+    def read(self, size: int = -1) -> memoryview:
+        if size is None or size < 0:
+            size = len(self._view) - self._offset
+
+        data = self._view[self._offset:self._offset + size]
+        self._offset += len(data)
+
+        return data
     
     def read_custom_type(self, size: int) -> int:
         return int.from_bytes(self.read(size), self.endian, signed = True)
@@ -18,28 +41,44 @@ class Reader(BytesIO):
         return int.from_bytes(self.read(size), self.endian, signed = False)
     
     def read_char(self) -> int:
-        return self.read_custom_type(1)
+        value, = self._structs.char.unpack_from(self._view, self._offset)
+        self._offset += 1
+        return value
     
     def read_unsigned_char(self) -> int:
-        return self.read_unsigned_custom_type(1)
+        value, = self._structs.unsigned_char.unpack_from(self._view, self._offset)
+        self._offset += 1
+        return value
     
     def read_short(self) -> int:
-        return self.read_custom_type(2)
+        value, = self._structs.short.unpack_from(self._view, self._offset)
+        self._offset += 2
+        return value
     
     def read_unsigned_short(self) -> int:
-        return self.read_unsigned_custom_type(2)
+        value, = self._structs.unsigned_short.unpack_from(self._view, self._offset)
+        self._offset += 2
+        return value
     
     def read_int(self) -> int:
-        return self.read_custom_type(4)
+        value, = self._structs.int.unpack_from(self._view, self._offset)
+        self._offset += 4
+        return value
     
     def read_unsigned_int(self) -> int:
-        return self.read_unsigned_custom_type(4)
+        value, = self._structs.unsigned_int.unpack_from(self._view, self._offset)
+        self._offset += 4
+        return value
     
     def read_long(self) -> int:
-        return self.read_custom_type(8)
+        value, = self._structs.long.unpack_from(self._view, self._offset)
+        self._offset += 8
+        return value
     
     def read_unsigned_long(self) -> int:
-        return self.read_unsigned_custom_type(8)
+        value, = self._structs.unsigned_long.unpack_from(self._view, self._offset)
+        self._offset += 8
+        return value
     
     def read_bool(self) -> bool:
         return self.read_unsigned_char()
@@ -47,34 +86,33 @@ class Reader(BytesIO):
     def read_ascii(self) -> str:
         size = self.read_unsigned_char()
         if size != 0xff:
-            return self.read(size).decode()
+            return bytes(self.read(size)).decode()
         return None
     
     def read_twip(self):
         return self.read_int() / 20
     
+    def read_struct(self, _struct: struct.Struct) -> tuple:
+        values = _struct.unpack_from(self._view, self._offset)
+        self._offset += _struct.size
+        return values
+    
     def read_matrix2x3(self):
-        scale_x = self.read_int() / 1024
-        rotation_x = self.read_int() / 1024
-        rotation_y = self.read_int() / 1024
-        scale_y = self.read_int() / 1024
-
-        x, y = self.read_twip(), self.read_twip()
+        scale_x, rotation_x, rotation_y, scale_y, x, y = self.read_struct(self._structs.matrix2x3)
 
         return [
-            [scale_x, rotation_x, x],
-            [rotation_y, scale_y, y]
+            [scale_x / 1024, rotation_x / 1024, x / 20],
+            [rotation_y / 1024, scale_y / 1024, y / 20]
         ]
     
     def read_bgra(self):
-        b = self.read_unsigned_char()
-        g = self.read_unsigned_char()
-        r = self.read_unsigned_char()
-        a = self.read_unsigned_char()
+        b, g, r, a = self.read_struct(self._structs.bgra)
         return [r, g, b, a]
     
     def read_bgr(self):
-        b = self.read_unsigned_char()
-        g = self.read_unsigned_char()
-        r = self.read_unsigned_char()
+        b, g, r = self.read_struct(self._structs.bgr)
         return [r, g, b]
+    
+    def read_transform(self):
+        # bind id, matrix id and color transform id of movie clip frame element
+        return self.read_struct(self._structs.transform)
@@ -0,0 +1,26 @@
+import struct
+
+
+
+class Structs:
+    def __init__(self, prefix: str) -> None:
+        self.char = struct.Struct(prefix + "b")
+        self.unsigned_char = struct.Struct(prefix + "B")
+        self.short = struct.Struct(prefix + "h")
+        self.unsigned_short = struct.Struct(prefix + "H")
+        self.int = struct.Struct(prefix + "i")
+        self.unsigned_int = struct.Struct(prefix + "I")
+        self.long = struct.Struct(prefix + "q")
+        self.unsigned_long = struct.Struct(prefix + "Q")
+
+        # Records, read and written in one call
+        self.matrix2x3 = struct.Struct(prefix + "iiiiii")
+        self.bgra = struct.Struct(prefix + "BBBB")
+        self.bgr = struct.Struct(prefix + "BBB")
+        self.transform = struct.Struct(prefix + "HHH")
+
+
+STRUCTS = {
+    "little": Structs("<"),
+    "big": Structs(">")
+}
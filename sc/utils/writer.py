@@ -1,21 +1,32 @@
-from io import BytesIO
+import struct
 
+from .structs import STRUCTS
+from .quantize import quantize_matrix
 
 
-class Writer(BytesIO):
+
+class Writer:
+    endian: str = "little"
+    _structs = STRUCTS["little"]
+
     def __init__(self, buffer: bytes = b"", endian: str = "little") -> None:
-        super().__init__(buffer)
-        self.endian = endian
+        # Given bytearray is written in place, so tags can be written right into their parent buffer
+        self._buffer = buffer if isinstance(buffer, bytearray) else bytearray(buffer)
+
+        if endian != self.endian:
+            self._structs = STRUCTS[endian]
+            self.endian = endian
     
     @property
     def buffer(self):
-        return self.getvalue()
+        return self._buffer
     
     @buffer.setter
     def buffer(self, data: bytes):
-        self.seek(0)
-        self.truncate(0)
-        self.write(data)
+        self._buffer = bytearray(data)
+    
+    def write(self, data: bytes) -> None:
+        self._buffer += data
     
     def write_custom_type(self, value: int, size: int) -> None:
         self.write(value.to_bytes(size, self.endian, signed = True))
@@ -24,28 +35,28 @@ class Writer(BytesIO):
         self.write(value.to_bytes(size, self.endian, signed = False))
     
     def write_char(self, value: int) -> None:
-        self.write_custom_type(value, 1)
+        self._buffer += self._structs.char.pack(value)
     
     def write_unsigned_char(self, value: int) -> None:
-        self.write_unsigned_custom_type(value, 1)
+        self._buffer += self._structs.unsigned_char.pack(value)
     
     def write_short(self, value: int) -> None:
-        self.write_custom_type(value, 2)
+        self._buffer += self._structs.short.pack(value)
     
     def write_unsigned_short(self, value: int) -> None:
-        self.write_unsigned_custom_type(value, 2)
+        self._buffer += self._structs.unsigned_short.pack(value)
     
     def write_int(self, value: int) -> None:
-        self.write_custom_type(value, 4)
+        self._buffer += self._structs.int.pack(value)
     
     def write_unsigned_int(self, value: int) -> None:
-        self.write_unsigned_custom_type(value, 4)
+        self._buffer += self._structs.unsigned_int.pack(value)
     
     def write_long(self, value: int) -> None:
-        self.write_custom_type(value, 8)
+        self._buffer += self._structs.long.pack(value)
     
     def write_unsigned_long(self, value: int) -> None:
-        self.write_unsigned_custom_type(value, 8)
+        self._buffer += self._structs.unsigned_long.pack(value)
     
     def write_bool(self, value: bool) -> None:
         self.write_unsigned_char(int(value))
@@ -60,24 +71,35 @@ class Writer(BytesIO):
     def write_twip(self, value: float):
         self.write_int(int(round(value * 20)))
     
+    def write_struct(self, _struct: struct.Struct, *values) -> None:
+        self._buffer += _struct.pack(*values)
+    
     def write_matrix2x3(self, matrix: list):
-        self.write_int(int(round(matrix[0][0] * 1024)))
-        self.write_int(int(round(matrix[0][1] * 1024)))
-        self.write_int(int(round(matrix[1][0] * 1024)))
-        self.write_int(int(round(matrix[1][1] * 1024)))
-
-        self.write_twip(matrix[0][2])
-        self.write_twip(matrix[1][2])
+        self.write_struct(self._structs.matrix2x3, *quantize_matrix(matrix))
     
     def write_bgra(self, color: list):
         r, g, b, a = color
-        self.write_unsigned_char(b)
-        self.write_unsigned_char(g)
-        self.write_unsigned_char(r)
-        self.write_unsigned_char(a)
+        self.write_struct(self._structs.bgra, b, g, r, a)
     
     def write_bgr(self, color: list):
         r, g, b = color
-        self.write_unsigned_char(b)
-        self.write_unsigned_char(g)
-        self.write_unsigned_char(r)
+        self.write_struct(self._structs.bgr, b, g, r)
+    
+    def write_transform(self, bind_id: int, matrix_id: int, color_transform_id: int):
+        self.write_struct(self._structs.transform, bind_id, matrix_id, color_transform_id)
+    
+    def write_tag(self, tag, *args) -> None:
+        self.write_unsigned_char(tag.tag)
+
+        # Length is reserved and patched after the tag is saved right into this buffer
+        position = len(self._buffer)
+        self._buffer += bytes(4)
+
+        tag._output = self._buffer
+        try:
+            tag.save(*args)
+        finally:
+            del tag._output
+            tag._buffer = bytearray()
+        
+        self._structs.unsigned_int.pack_into(self._buffer, position, len(self._buffer) - position - 4)
@@ -26,6 +26,9 @@ setuptools.setup(
     license="GPLv3",
     packages=setuptools.find_packages(),
     install_requires=requirements,
+    entry_points={
+        'console_scripts': ['supercellswf = sc.__main__:main'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
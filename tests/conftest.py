@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from PIL import Image
+
+from sc import SupercellSWF, SWFTexture, Shape, TextField, MovieClip
+
+
+
+def build_swf() -> SupercellSWF:
+    # Small file with every kind of object, shared sub-clips and repeated transforms
+    swf = SupercellSWF()
+
+    for tag, mode, size in [(1, "RGBA", (70, 45)), (28, "RGBA", (100, 77)), (27, "RGB", (40, 33))]:
+        texture = SWFTexture(tag)
+        texture.from_image(Image.frombytes(mode, size, os.urandom(size[0] * size[1] * len(mode))))
+        swf.textures.append(texture)
+
+    export_id = 0
+
+    shapes = []
+    for i in range(6):
+        shape = Shape()
+        shape.export_id = export_id
+        shape.create_bitmap(swf.textures[i % len(swf.textures)], [(0, 0), (10.5, 0), (10.5, 7.25), (0, 7.25)], [(1, 1), (20, 1), (20, 15), (1, 15)])
+
+        shapes.append(shape)
+        export_id += 1
+
+    text_field = TextField()
+    text_field.export_id = export_id
+    text_field.text = "text"
+    text_field.font = "font"
+    export_id += 1
+
+    movie_clips = []
+    for i in range(3):
+        movie_clip = MovieClip()
+        movie_clip.export_id = export_id
+        export_id += 1
+
+        for shape in shapes[i * 2:i * 2 + 2]:
+            movie_clip.bind(shape)
+        
+        movie_clip.bind(text_field)
+
+        for frame_index in range(4):
+            for bind_index in range(3):
+                movie_clip.keyframe(frame_index, bind_index, translation=[frame_index % 2, bind_index], alpha=200 if bind_index == 2 else None)
+        
+        movie_clips.append(movie_clip)
+
+    for i, movie_clip in enumerate(movie_clips):
+        swf.create_export(movie_clip, f"clip_{i}")
+
+    return swf
+
+
+@pytest.fixture
+def swf():
+    return build_swf()
+
+
+@pytest.fixture
+def swf_path(tmp_path):
+    fp = str(tmp_path / "file.sc")
+    build_swf().save(fp)
+
+    return fp
+
+
+@pytest.fixture
+def nested_swf_path(tmp_path):
+    # Clip that binds an exported clip, it comes after the bound clip in file
+    swf = build_swf()
+
+    movie_clip = MovieClip()
+    movie_clip.export_id = 10
+    movie_clip.bind(swf.get_export_by_name("clip_0"))
+    movie_clip.keyframe(0, 0, translation=[1, 2])
+
+    swf.create_export(movie_clip, "nested")
+
+    fp = str(tmp_path / "nested.sc")
+    swf.save(fp)
+
+    return fp
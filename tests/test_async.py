@@ -0,0 +1,22 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from sc import SupercellSWF
+
+
+
+def test_process_load_of_exports(swf_path):
+    async def load():
+        with ProcessPoolExecutor(1) as executor:
+            # Lazy lists would be parsed whole to be sent back, selected exports come back as plain lists
+            with pytest.raises(TypeError):
+                await SupercellSWF.aload(swf_path, executor, lazy=True)
+
+            return await SupercellSWF.aload(swf_path, executor, exports=["clip_1"])
+
+    swf = asyncio.run(load())
+
+    assert [movie_clip.export_id for movie_clip in swf.movie_clips] == [8]
+    assert len(swf.shapes) == 2
@@ -0,0 +1,24 @@
+import os
+
+from sc import MovieClip
+from sc.__main__ import main
+
+
+
+def test_render_counts_written_files(swf, tmp_path, capsys):
+    movie_clip = MovieClip()
+    movie_clip.export_id = 10
+    swf.create_export(movie_clip, "empty")
+
+    fp = str(tmp_path / "file.sc")
+    swf.save(fp)
+
+    # GIF left by an earlier run isn't counted as rendered again
+    output = str(tmp_path / "out")
+    os.makedirs(os.path.join(output, "file"))
+    open(os.path.join(output, "file", "empty.gif"), "wb").close()
+
+    assert main(["render", fp, "-o", output]) == 0
+    assert "3 exports, 1 skipped" in capsys.readouterr().out
+
+    assert sorted(os.listdir(os.path.join(output, "file"))) == ["clip_0.gif", "clip_1.gif", "clip_2.gif"]
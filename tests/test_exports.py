@@ -0,0 +1,20 @@
+from sc import SupercellSWF
+
+
+
+def test_selected_nested_clip_round_trip(nested_swf_path, tmp_path):
+    swf = SupercellSWF()
+    swf.load(nested_swf_path, exports=["nested"])
+
+    # Bound clip comes first, movie clips find their binds by id while they are loaded
+    assert [movie_clip.export_id for movie_clip in swf.movie_clips] == [7, 10]
+
+    save_fp = str(tmp_path / "saved.sc")
+    swf.save(save_fp)
+
+    saved = SupercellSWF()
+    saved.load(save_fp)
+
+    assert [movie_clip.export_id for movie_clip in saved.movie_clips] == [7, 10]
+    assert saved.get_export_by_name("nested").binds[0] is saved.movie_clips[0]
+    assert len(saved.shapes) == 2
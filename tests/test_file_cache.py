@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from sc import FileCache
+
+
+
+def test_concurrent_writes_of_same_key(tmp_path):
+    cache = FileCache(str(tmp_path))
+    key = cache.key("objects", "file.sc")
+
+    datas = [bytes([i]) * (1 << 16) for i in range(16)]
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda data: cache.write(key, data), datas))
+
+    # One of writes wins as a whole, no temporary files are left
+    assert cache.read(key) in datas
+    assert os.listdir(str(tmp_path)) == [key]
+
+
+def test_cache_entries_of_loads(swf_path, tmp_path):
+    from sc import SupercellSWF
+
+    directory = tmp_path / "cache"
+    cache = FileCache(str(directory))
+
+    # Eager load keeps only its objects, lazy load only decompressed content
+    SupercellSWF().load(swf_path, cache=cache)
+    assert len(os.listdir(str(directory))) == 1
+
+    SupercellSWF().load(swf_path, lazy=True, cache=cache)
+    assert len(os.listdir(str(directory))) == 2
+
+    swf = SupercellSWF()
+    swf.load(swf_path, cache=cache)
+    assert len(swf.movie_clips) == 3
+
+
+def test_pickle_format_is_part_of_objects_key(swf_path, tmp_path, monkeypatch):
+    import sc.swf
+    from sc import SupercellSWF
+
+    directory = tmp_path / "cache"
+    cache = FileCache(str(directory))
+
+    SupercellSWF().load(swf_path, cache=cache)
+
+    # Objects pickled by other versions of classes are never unpickled
+    monkeypatch.setattr(sc.swf, "PICKLE_FORMAT", sc.swf.PICKLE_FORMAT + 1)
+    SupercellSWF().load(swf_path, cache=cache)
+    assert len(os.listdir(str(directory))) == 2
+
+
+def test_concurrent_unpickles_keep_garbage_collector(swf_path):
+    import gc
+    import pickle
+    from sc.swf import load_file, unpickle
+
+    data = pickle.dumps(load_file(swf_path), pickle.HIGHEST_PROTOCOL)
+
+    assert gc.isenabled()
+    with ThreadPoolExecutor(8) as executor:
+        swfs = list(executor.map(unpickle, [data] * 64))
+
+    assert gc.isenabled()
+    assert all(len(swf.movie_clips) == 3 for swf in swfs)
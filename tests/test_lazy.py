@@ -0,0 +1,58 @@
+from sc import SupercellSWF
+
+
+
+def test_lazy_create_export_of_loaded_clip(swf_path, tmp_path):
+    swf = SupercellSWF()
+    swf.load(swf_path, lazy=True)
+
+    # Clip is loaded through export index, its slot in lazy list isn't touched yet
+    swf.create_export(swf.get_export_by_name("clip_1"), "again")
+
+    assert len(swf.movie_clips) == 3
+    assert len(swf.shapes) == 6
+    assert len(swf.text_fields) == 1
+
+    save_fp = str(tmp_path / "saved.sc")
+    swf.save(save_fp)
+
+    saved = SupercellSWF()
+    saved.load(save_fp)
+
+    assert [movie_clip.export_id for movie_clip in saved.movie_clips] == [7, 8, 9]
+    assert [(export.export_id, export.name) for export in saved.exports] == [(7, "clip_0"), (8, "clip_1"), (9, "clip_2"), (8, "again")]
+
+
+def test_lazy_save_matches_eager_save(swf_path, tmp_path):
+    saved = []
+    for lazy in (False, True):
+        swf = SupercellSWF()
+        swf.load(swf_path, lazy=lazy)
+
+        save_fp = str(tmp_path / f"saved_{lazy}.sc")
+        swf.save(save_fp)
+
+        saved.append(open(save_fp, 'rb').read())
+
+    assert saved[0] == saved[1]
+
+
+def test_lazy_lists_find_objects_loaded_through_index(swf_path):
+    swf = SupercellSWF()
+    swf.load(swf_path, lazy=True)
+
+    movie_clip = swf.get_export_by_name("clip_1")
+
+    # Answers are the same whether objects were reached through index or list
+    for _ in range(2):
+        assert movie_clip in swf.movie_clips
+        assert swf.movie_clips.index(movie_clip) == 1
+        assert swf.movie_clips.count(movie_clip) == 1
+        assert movie_clip.binds[0] in swf.shapes
+        assert swf.shapes.index(movie_clip.binds[1]) == 3
+
+        list(swf.movie_clips)
+        list(swf.shapes)
+    
+    swf.movie_clips.remove(movie_clip)
+    assert [movie_clip.export_id for movie_clip in swf.movie_clips] == [7, 9]
@@ -0,0 +1,20 @@
+import struct
+
+from sc.objects import Matrix2x3, ColorTransform, MatrixArray, ColorTransformArray
+
+
+
+def test_keys_match_saved_values():
+    matrix = Matrix2x3()
+    matrix.matrix = [[0.5004, -0.25, 12.375], [1 / 3, 2.5, -3.425]]
+
+    color_transform = ColorTransform()
+    color_transform.addition = [10, 20, 30, 200]
+    color_transform.multiplier = [40, 50, 60]
+
+    for item, array, fmt in [(matrix, MatrixArray(), "<6i"), (color_transform, ColorTransformArray(), "<7B")]:
+        item.save()
+        assert struct.unpack(fmt, item.buffer) == item.key()
+
+        array.append(item)
+        assert tuple(array.encode(array.values)[0].tolist()) == item.key()
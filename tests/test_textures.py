@@ -0,0 +1,112 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import sc.swf
+from sc import SupercellSWF
+from sc.objects.texture import encode_pixels, decode_image
+
+
+
+def make_rgba4444_file(swf_path: str, tmp_path) -> str:
+    # Textures made from images are saved as RGBA8888, so a loaded one gets RGBA4444 pixels
+    swf = SupercellSWF()
+    swf.load(swf_path)
+
+    texture = swf.textures[0]
+    pixels = np.frombuffer(os.urandom(texture.width * texture.height * 4), np.uint8).reshape(-1, 4)
+
+    texture.pixel_type = 2
+    texture._data = encode_pixels(pixels, 2)
+    texture._data_header = (texture.tag, 2, texture.width, texture.height)
+
+    fp = str(tmp_path / "rgba4444.sc")
+    swf.save(fp)
+
+    return fp
+
+
+def resave(fp: str, tmp_path, name: str, **kwargs) -> bytes:
+    swf = SupercellSWF()
+    swf.load(fp, **kwargs)
+
+    # Decoding images for use doesn't change what is saved
+    for texture in swf.textures:
+        texture.image
+
+    save_fp = str(tmp_path / name)
+    swf.save(save_fp)
+
+    return open(save_fp, 'rb').read()
+
+
+def test_saved_textures_dont_depend_on_workers(swf_path, tmp_path):
+    fp = make_rgba4444_file(swf_path, tmp_path)
+    original = open(fp, 'rb').read()
+
+    assert resave(fp, tmp_path, "workers_1.sc", workers=1) == original
+    assert resave(fp, tmp_path, "workers_2.sc", workers=2) == original
+
+
+def test_set_image_replaces_loaded_pixels(swf_path, tmp_path):
+    fp = make_rgba4444_file(swf_path, tmp_path)
+
+    swf = SupercellSWF()
+    swf.load(fp)
+
+    texture = swf.textures[0]
+    texture.image = texture.image.convert("RGBA")
+
+    save_fp = str(tmp_path / "saved.sc")
+    swf.save(save_fp)
+
+    saved = SupercellSWF()
+    saved.load(save_fp)
+
+    assert saved.textures[0].pixel_type == 0
+    assert saved.textures[0].image.tobytes() == texture.image.tobytes()
+
+
+def test_image_changed_in_place_is_saved(swf_path, tmp_path):
+    fp = make_rgba4444_file(swf_path, tmp_path)
+
+    swf = SupercellSWF()
+    swf.load(fp)
+
+    texture = swf.textures[0]
+    texture.image.paste((255, 0, 0, 255), (0, 0, 4, 4))
+
+    save_fp = str(tmp_path / "saved.sc")
+    swf.save(save_fp)
+
+    saved = SupercellSWF()
+    saved.load(save_fp)
+
+    # Changed image is encoded again in the pixel type it was loaded with
+    assert saved.textures[0].pixel_type == 2
+    assert saved.textures[0].image.getpixel((0, 0)) == (240, 0, 0, 240)
+    assert saved.textures[0].image.getpixel((5, 5)) == texture.image.getpixel((5, 5))
+
+def test_external_textures_are_decoded_once(swf_path, tmp_path, monkeypatch):
+    swf = SupercellSWF()
+    swf.load(swf_path)
+    swf.external_texture_file = True
+
+    fp = str(tmp_path / "external.sc")
+    swf.save(fp)
+
+    decoded = []
+    def counting_decode_image(*args):
+        decoded.append(args[1:])
+        return decode_image(*args)
+
+    # Threads see the counting function, worker processes would import their own
+    monkeypatch.setattr(sc.swf, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(sc.swf, "decode_image", counting_decode_image)
+
+    loaded = SupercellSWF()
+    loaded.load(fp, workers=2)
+
+    assert len(decoded) == len(loaded.textures) == 3
+    assert all(texture._decoded is not None for texture in loaded.textures)
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from sc import SupercellSWF, SWFTexture
+from sc.objects.texture import CHUNK_SIZE, tile_pixels, untile_pixels, encode_pixels
+
+
+SIZES = [(1000, 777), (31, 5), (33, 65), (1, 40)]
+
+
+def baseline_order(width: int, height: int) -> list:
+    # Pixel order of tiled textures, as the original per pixel loops wrote it
+    order = []
+
+    x_chunks_count = width // CHUNK_SIZE
+    y_chunks_count = height // CHUNK_SIZE
+    x_rest = width % CHUNK_SIZE
+    y_rest = height % CHUNK_SIZE
+
+    for y_chunk in range(y_chunks_count):
+        for x_chunk in range(x_chunks_count):
+            for y in range(CHUNK_SIZE):
+                for x in range(CHUNK_SIZE):
+                    order.append((y_chunk * CHUNK_SIZE + y) * width + x_chunk * CHUNK_SIZE + x)
+
+        for y in range(CHUNK_SIZE):
+            for x in range(x_rest):
+                order.append((y_chunk * CHUNK_SIZE + y) * width + width - x_rest + x)
+
+    for x_chunk in range(x_chunks_count):
+        for y in range(y_rest):
+            for x in range(CHUNK_SIZE):
+                order.append((height - y_rest + y) * width + x_chunk * CHUNK_SIZE + x)
+
+    for y in range(y_rest):
+        for x in range(x_rest):
+            order.append((height - y_rest + y) * width + width - x_rest + x)
+
+    return order
+
+
+def random_pixels(width: int, height: int) -> np.ndarray:
+    return np.frombuffer(os.urandom(width * height * 4), np.uint8).reshape(width * height, 4)
+
+
+@pytest.mark.parametrize("width, height", SIZES)
+def test_tile_pixels_matches_baseline(width, height):
+    pixels = random_pixels(width, height)
+    tiled = tile_pixels(pixels, width, height)
+
+    assert np.array_equal(tiled, pixels[baseline_order(width, height)])
+    assert np.array_equal(untile_pixels(tiled, width, height), pixels)
+
+
+@pytest.mark.parametrize("tag", [27, 28])
+@pytest.mark.parametrize("width, height", SIZES)
+def test_tiled_texture_round_trip(tag, width, height, tmp_path):
+    pixels = random_pixels(width, height)
+
+    texture = SWFTexture(tag)
+    texture.from_image(Image.frombytes("RGBA", (width, height), pixels.tobytes()))
+
+    swf = SupercellSWF()
+    swf.textures.append(texture)
+
+    fp = str(tmp_path / "tiled.sc")
+    swf.save(fp, file_version=3)
+
+    loaded = SupercellSWF()
+    loaded.load(fp)
+
+    # Pixels are stored in baseline order and come back as the same image
+    assert bytes(loaded.textures[0]._data) == encode_pixels(pixels[baseline_order(width, height)], 0)
+    assert loaded.textures[0].image.tobytes() == pixels.tobytes()